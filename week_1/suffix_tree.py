@@ -20,11 +20,17 @@
     Rather, we mean the comparison order, which is lexicographical (alphabetical).
     The comparison order becomes important when we want to create a Suffix Array from a Suffix Tree.
     Still, that problem is solvable externally to the tree.
+
+    Traversal yields (start, end) positions of the edges, instead of printing their labels one by one.
+    write_edges() from "suffix_tree_v2.py" joins the labels into large buffers and writes them to the binary stdout,
+    because for trees with millions of edges one print() per edge took more time than building the tree.
 """
 
 import sys
 from collections import deque
 
+from suffix_tree_v2 import write_edges
+
 
 class Node:
     """
@@ -39,8 +45,55 @@ class Node:
         self.leaf_start = leaf_start
 
 
-def build_tree(text):
-    """Build suffix tree from text and return it"""
+def build_tree(text, stats=None):
+    """Build suffix tree from text and return it
+
+       If stats, a BuildStats from "suffix_tree_debug.py", is given, the tree is built by _build_tree_counted(),
+       which counts the construction into it, so that this loop doesn't pay for the counters.
+    """
+    if stats is not None:
+        return _build_tree_counted(text, stats)
+    suffix_length = 1 + len(text)
+    root = Node()
+    for i in range(len(text)):
+        suffix = text[i:]
+        suffix_length -= 1
+        current = root
+        j = 0
+        while j < suffix_length:
+            try:
+                next_node = current.children[suffix[j]]
+            except KeyError:
+                new_leaf = Node(start=i+j, length=suffix_length-j, leaf_start=i)
+                current.children[suffix[j]] = new_leaf
+                j += new_leaf.length  # break
+            else:
+                overlap = 0
+                while suffix[j+overlap] == text[next_node.start+overlap] and overlap < next_node.length:
+                    overlap += 1
+                if overlap == next_node.length:
+                    current = next_node
+                    j += overlap
+                else:
+                    new_internal = Node(start=next_node.start, length=overlap)
+                    new_leaf = Node(start=i+j+overlap, length=suffix_length-j-overlap, leaf_start=i)
+                    next_node.start += overlap
+                    next_node.length -= overlap
+                    new_internal.children[text[new_leaf.start]] = new_leaf
+                    new_internal.children[text[next_node.start]] = next_node
+                    current.children[text[new_internal.start]] = new_internal
+                    break
+    return root
+
+
+def _build_tree_counted(text, stats):
+    """Build suffix tree from text like build_tree(), count the comparisons of characters, the splits,
+       the nodes and the peak depth into stats, and return it
+    """
+    comparisons = 0
+    splits = 0
+    nodes = 1
+    peak_depth = 0
     suffix_length = 1 + len(text)
     root = Node()
     for i in range(len(text)):
@@ -54,11 +107,15 @@ def build_tree(text):
             except KeyError:
                 new_leaf = Node(start=i+j, length=suffix_length-j, leaf_start=i)
                 current.children[suffix[j]] = new_leaf
+                nodes += 1
+                if j > peak_depth:
+                    peak_depth = j
                 j += new_leaf.length  # break
             else:
                 overlap = 0
                 while suffix[j+overlap] == text[next_node.start+overlap] and overlap < next_node.length:
                     overlap += 1
+                comparisons += overlap + 1  # The last comparison is the one that stopped the loop.
                 if overlap == next_node.length:
                     current = next_node
                     j += overlap
@@ -70,62 +127,67 @@ def build_tree(text):
                     new_internal.children[text[new_leaf.start]] = new_leaf
                     new_internal.children[text[next_node.start]] = next_node
                     current.children[text[new_internal.start]] = new_internal
+                    splits += 1
+                    nodes += 2
+                    if j + overlap > peak_depth:
+                        peak_depth = j + overlap
                     break
+    stats.record(comparisons, splits, nodes, peak_depth)
     return root
 
 
-def _traverse_tree_recursive(tree, text):
+def _traverse_tree_recursive(tree):
 
-    def traverse(node, text):
+    def traverse(node):
         """Pre-order"""
         if node is None:
             return
-        print(text[node.start:node.start+node.length])  # Visit.
+        yield node.start, node.start + node.length  # Visit.
         for child in node.children.values():
-            traverse(child, text)
+            yield from traverse(child)
 
     for child in tree.children.values():
-        traverse(child, text)
+        yield from traverse(child)
 
 
-def _traverse_tree_level_order(tree, text):
+def _traverse_tree_level_order(tree):
     q = deque()
     for child in tree.children.values():
         q.append(child)
     while q:
         node = q.popleft()
-        print(text[node.start:node.start+node.length])
+        yield node.start, node.start + node.length
         for child in node.children.values():
             q.append(child)
 
 
-def _traverse_tree_dfs_(tree, text):
+def _traverse_tree_dfs_(tree):
     stack = list()
     for child in tree.children.values():
         stack.append(child)
     while stack:
         node = stack.pop()
-        print(text[node.start:node.start+node.length])
+        yield node.start, node.start + node.length
         for child in node.children.values():
             stack.append(child)
 
 
-def _traverse_tree_dfs(tree, text):
+def _traverse_tree_dfs(tree):
     stack = list()
     stack.append(tree)
     while stack:
         node = stack.pop()
         for child in node.children.values():
-            print(text[child.start:child.start+child.length])
+            yield child.start, child.start + child.length
             stack.append(child)
 
 
 def traverse_tree(tree, text):
-    """Traverse tree and return all its edges using text"""
+    """Traverse tree and write all its edges using text"""
     # We are not printing root!
     if tree is None:
         return
-    _traverse_tree_level_order(tree, text)
+    write_edges(_traverse_tree_level_order(tree), text)
 
 
 def build_suffix_tree(text):
@@ -0,0 +1,420 @@
+""" Suffix tree stored in flat typed arrays (struct of arrays), instead of one Python object per node
+
+    A Node from "suffix_tree_v2.py" is an object with a __dict__ and a children dictionary of its own.
+    That's a few hundred bytes per node, and a suffix tree of a text of length n has up to 2n nodes,
+    so the tree of a text of length 10^6 takes about 2 million Python objects and hundreds of megabytes.
+
+    Here a node is just an integer, its index in parallel columns, and the root is node 0:
+        start, end     - position of the label of the edge that leads into the node, like Node.start and Node.end;
+        leaf_start     - position in text at which the path to the leaf begins, or -1 for internal nodes;
+        first_child    - the first child of the node, or -1 for leaves;
+        next_sibling   - the next child of the node's parent, or -1 for the last one.
+    Children in the sibling lists are in the same order as in the children dictionaries of the tree from
+    "suffix_tree_v2.py", so traverse_tree() writes exactly the same edges, in the same order.
+    Finding a child by its first character in a sibling list takes a linear scan, though, so there's also a sorted
+    child index in compressed sparse row form: children of node v, sorted by the first character of their edge,
+    are child_index[child_offset[v]: child_offset[v + 1]], and child() finds one of them with a binary search.
+    All columns have typecode 'i' (4 bytes) if node indices and positions fit in it, and 'q' (8 bytes) otherwise,
+    so a node takes 28 bytes. That's more than 5 times less than a Node, which is measured in "suffix_tree_testing.py".
+
+    The tree is built directly into the arrays, with Ukkonen's algorithm like in "suffix_tree_ukkonen.py",
+    so there's no moment when the tree exists as objects. While building, a child is found by scanning the
+    sibling list. That's O(alphabet size), so the construction is O(n * alphabet size).
+    Suffix links and the numbers that the normalization pass needs are kept in temporary arrays of the same kind.
+
+    The columns can be any sequences of integers that support indexing, such as arrays or memoryviews,
+    so that the tree doesn't have to be built in memory at all.
+"""
+
+import sys
+from array import array
+from collections import deque
+from contextlib import nullcontext
+
+from suffix_tree_v2 import write_edges
+
+
+class ArraySuffixTree:
+    """
+    Suffix tree of text stored in parallel columns of integers; node 0 is the root.
+    The columns can be any sequences of integers that support indexing, such as arrays or memoryviews.
+    """
+
+    def __init__(self, text, start, end, leaf_start, first_child, next_sibling, child_offset, child_index):
+        self.text = text
+        self.start = start
+        self.end = end
+        self.leaf_start = leaf_start
+        self.first_child = first_child
+        self.next_sibling = next_sibling
+        self.child_offset = child_offset
+        self.child_index = child_index
+
+    def is_leaf(self, node):
+        return self.leaf_start[node] != -1
+
+    def label(self, node):
+        """Return label of the edge that leads into node"""
+        return self.text[self.start[node]: self.end[node]]
+
+    def children(self, node):
+        """Return children of node, in the same order as in the tree from "suffix_tree_v2.py" """
+        result = []
+        child = self.first_child[node]
+        while child != -1:
+            result.append(child)
+            child = self.next_sibling[child]
+        return result
+
+    def sorted_children(self, node):
+        """Return children of node, sorted by the first character of their edges"""
+        return self.child_index[self.child_offset[node]: self.child_offset[node + 1]]
+
+    def child(self, node, symbol):
+        """Return the child of node whose edge starts with symbol, or -1 if there's no such child"""
+        text = self.text
+        start = self.start
+        child_index = self.child_index
+        low = self.child_offset[node]
+        high = self.child_offset[node + 1]
+        while low < high:
+            middle = (low + high) // 2
+            first = text[start[child_index[middle]]]
+            if first == symbol:
+                return child_index[middle]
+            if first < symbol:
+                low = middle + 1
+            else:
+                high = middle
+        return -1
+
+    def locus(self, pattern):
+        """Return the highest node whose path from the root starts with pattern, or -1 if pattern doesn't occur"""
+        text = self.text
+        node = 0
+        i = 0
+        pattern_length = len(pattern)
+        while i < pattern_length:
+            node = self.child(node, pattern[i])
+            if node == -1:
+                return -1
+            start = self.start[node]
+            length = min(self.end[node] - start, pattern_length - i)
+            if text[start: start + length] != pattern[i: i + length]:
+                return -1
+            i += length
+        return node
+
+    def __contains__(self, pattern):
+        return self.locus(pattern) != -1
+
+    def nbytes(self):
+        """Return number of bytes taken by the node columns"""
+        columns = (self.start, self.end, self.leaf_start, self.first_child, self.next_sibling,
+                   self.child_offset, self.child_index)
+        return sum(memoryview(column).nbytes for column in columns)
+
+    def __len__(self):
+        return len(self.start)
+
+
+def _typecode(text):
+    """Return typecode of columns for the tree of text: 'i' if it fits in 32 bits, 'q' otherwise"""
+    return 'i' if 2 * len(text) < 2**31 else 'q'
+
+
+def _build_columns_ukkonen(text, typecode):
+    """Build suffix tree of text with Ukkonen's algorithm and return its columns
+       (start, end, leaf_start, first_child, next_sibling)
+    """
+    n = len(text)
+    start = array(typecode, [0])
+    end = array(typecode, [0])
+    leaf_start = array(typecode, [-1])
+    first_child = array(typecode, [-1])
+    next_sibling = array(typecode, [-1])
+    suffix_link = array(typecode, [0])
+
+    def new_node(node_start, node_end, node_leaf_start):
+        start.append(node_start)
+        end.append(node_end)
+        leaf_start.append(node_leaf_start)
+        first_child.append(-1)
+        next_sibling.append(-1)
+        suffix_link.append(0)
+        return len(start) - 1
+
+    # Leaves get end = n right away, instead of being open: the active point never goes down a leaf edge
+    # as far as the current end of text, so a longer leaf edge doesn't change any decision of the algorithm.
+    active_node = 0
+    active_edge = 0  # Position in text of the first character of the active edge.
+    active_length = 0
+    remainder = 0
+    for i, char in enumerate(text):
+        remainder += 1
+        last_internal = -1
+        while remainder > 0:
+            if active_length == 0:
+                active_edge = i
+            edge_char = text[active_edge]
+            previous = -1
+            next_node = first_child[active_node]
+            while next_node != -1 and text[start[next_node]] != edge_char:
+                previous = next_node
+                next_node = next_sibling[next_node]
+            if next_node == -1:
+                leaf = new_node(i, n, i - remainder + 1)
+                next_sibling[leaf] = first_child[active_node]
+                first_child[active_node] = leaf
+                if last_internal != -1:
+                    suffix_link[last_internal] = active_node
+                    last_internal = -1
+            else:
+                next_start = start[next_node]
+                edge_length = end[next_node] - next_start
+                if active_length >= edge_length:
+                    active_edge += edge_length
+                    active_length -= edge_length
+                    active_node = next_node
+                    continue
+                if text[next_start + active_length] == char:
+                    if last_internal != -1:
+                        suffix_link[last_internal] = active_node
+                    active_length += 1
+                    break
+                split = new_node(next_start, next_start + active_length, -1)
+                next_sibling[split] = next_sibling[next_node]
+                if previous == -1:
+                    first_child[active_node] = split
+                else:
+                    next_sibling[previous] = split
+                leaf = new_node(i, n, i - remainder + 1)
+                start[next_node] = next_start + active_length
+                first_child[split] = leaf
+                next_sibling[leaf] = next_node
+                next_sibling[next_node] = -1
+                if last_internal != -1:
+                    suffix_link[last_internal] = split
+                last_internal = split
+            remainder -= 1
+            if active_node == 0 and active_length > 0:
+                active_length -= 1
+                active_edge = i - remainder + 1
+            elif active_node != 0:
+                active_node = suffix_link[active_node]
+    return start, end, leaf_start, first_child, next_sibling
+
+
+def _build_columns_ukkonen_counted(text, typecode, stats):
+    """Build suffix tree of text like _build_columns_ukkonen(), count the comparisons of characters, the splits,
+       the nodes and the peak depth into stats, and return its columns
+    """
+    comparisons = 0
+    splits = 0
+    peak_remainder = 0
+    n = len(text)
+    start = array(typecode, [0])
+    end = array(typecode, [0])
+    leaf_start = array(typecode, [-1])
+    first_child = array(typecode, [-1])
+    next_sibling = array(typecode, [-1])
+    suffix_link = array(typecode, [0])
+
+    def new_node(node_start, node_end, node_leaf_start):
+        start.append(node_start)
+        end.append(node_end)
+        leaf_start.append(node_leaf_start)
+        first_child.append(-1)
+        next_sibling.append(-1)
+        suffix_link.append(0)
+        return len(start) - 1
+
+    # Leaves get end = n right away, instead of being open: the active point never goes down a leaf edge
+    # as far as the current end of text, so a longer leaf edge doesn't change any decision of the algorithm.
+    active_node = 0
+    active_edge = 0  # Position in text of the first character of the active edge.
+    active_length = 0
+    remainder = 0
+    for i, char in enumerate(text):
+        remainder += 1
+        last_internal = -1
+        while remainder > 0:
+            if active_length == 0:
+                active_edge = i
+            edge_char = text[active_edge]
+            previous = -1
+            next_node = first_child[active_node]
+            while next_node != -1 and text[start[next_node]] != edge_char:
+                previous = next_node
+                next_node = next_sibling[next_node]
+            if next_node == -1:
+                leaf = new_node(i, n, i - remainder + 1)
+                next_sibling[leaf] = first_child[active_node]
+                first_child[active_node] = leaf
+                if remainder > peak_remainder:
+                    peak_remainder = remainder
+                if last_internal != -1:
+                    suffix_link[last_internal] = active_node
+                    last_internal = -1
+            else:
+                next_start = start[next_node]
+                edge_length = end[next_node] - next_start
+                if active_length >= edge_length:
+                    active_edge += edge_length
+                    active_length -= edge_length
+                    active_node = next_node
+                    continue
+                comparisons += 1
+                if text[next_start + active_length] == char:
+                    if last_internal != -1:
+                        suffix_link[last_internal] = active_node
+                    active_length += 1
+                    break
+                split = new_node(next_start, next_start + active_length, -1)
+                next_sibling[split] = next_sibling[next_node]
+                if previous == -1:
+                    first_child[active_node] = split
+                else:
+                    next_sibling[previous] = split
+                leaf = new_node(i, n, i - remainder + 1)
+                start[next_node] = next_start + active_length
+                first_child[split] = leaf
+                next_sibling[leaf] = next_node
+                next_sibling[next_node] = -1
+                splits += 1
+                if remainder > peak_remainder:
+                    peak_remainder = remainder
+                if last_internal != -1:
+                    suffix_link[last_internal] = split
+                last_internal = split
+            remainder -= 1
+            if active_node == 0 and active_length > 0:
+                active_length -= 1
+                active_edge = i - remainder + 1
+            elif active_node != 0:
+                active_node = suffix_link[active_node]
+    stats.record(comparisons, splits, len(start), max(peak_remainder - 1, 0))
+    return start, end, leaf_start, first_child, next_sibling
+
+
+def _normalize(text, start, end, leaf_start, first_child, next_sibling, typecode):
+    """Set edge positions and order of children the way the naive algorithm does,
+       like _normalize() in "suffix_tree_ukkonen.py"
+    """
+    nodes = len(start)
+    depth = array(typecode, [0]) * nodes  # String depth.
+    order = array(typecode)  # Pre-order.
+    stack = [0]
+    while stack:
+        node = stack.pop()
+        order.append(node)
+        child = first_child[node]
+        while child != -1:
+            depth[child] = depth[node] + end[child] - start[child]
+            stack.append(child)
+            child = next_sibling[child]
+
+    smallest = array(typecode, leaf_start)  # The smallest leaf_start in the subtree.
+    for node in reversed(order):
+        if leaf_start[node] == -1:
+            child = first_child[node]
+            best = smallest[child]
+            child = next_sibling[child]
+            while child != -1:
+                if smallest[child] < best:
+                    best = smallest[child]
+                child = next_sibling[child]
+            smallest[node] = best
+
+    length = len(text)
+    for node in order:
+        if leaf_start[node] != -1:
+            continue
+        children = []
+        child = first_child[node]
+        while child != -1:
+            children.append(child)
+            child = next_sibling[child]
+        children.sort(key=smallest.__getitem__)
+        if node != 0:
+            children[0], children[1] = children[1], children[0]
+        first_child[node] = children[0]
+        for child, following in zip(children, children[1:] + [-1]):
+            next_sibling[child] = following
+            start[child] = smallest[child] + depth[node]
+            end[child] = length if leaf_start[child] != -1 else smallest[child] + depth[child]
+
+
+def _sorted_child_index(text, start, first_child, next_sibling, typecode):
+    """Return (child_offset, child_index) - children of every node, sorted by the first character of their edges"""
+    nodes = len(start)
+    child_offset = array(typecode, [0])
+    child_index = array(typecode)
+    for node in range(nodes):
+        children = []
+        child = first_child[node]
+        while child != -1:
+            children.append((text[start[child]], child))
+            child = next_sibling[child]
+        children.sort()
+        child_index.extend(child for _, child in children)
+        child_offset.append(len(child_index))
+    return child_offset, child_index
+
+
+def build_tree(text, stats=None):
+    """Build suffix tree from text and return it as an ArraySuffixTree
+
+       If stats, a BuildStats from "suffix_tree_debug.py", is given, the columns are built by
+       _build_columns_ukkonen_counted(), which counts the construction into it, and the times of the phases
+       are measured.
+    """
+    typecode = _typecode(text)
+    phase = nullcontext if stats is None else stats.phase
+    with phase("ukkonen"):
+        if stats is None:
+            start, end, leaf_start, first_child, next_sibling = _build_columns_ukkonen(text, typecode)
+        else:
+            start, end, leaf_start, first_child, next_sibling = _build_columns_ukkonen_counted(text, typecode, stats)
+    with phase("normalize"):
+        _normalize(text, start, end, leaf_start, first_child, next_sibling, typecode)
+    with phase("child index"):
+        child_offset, child_index = _sorted_child_index(text, start, first_child, next_sibling, typecode)
+    return ArraySuffixTree(text, start, end, leaf_start, first_child, next_sibling, child_offset, child_index)
+
+
+def _traverse_tree_level_order(tree):
+    """Yield (start, end) of all edges of tree, in level order, like in "suffix_tree_v2.py" """
+    start = tree.start
+    end = tree.end
+    first_child = tree.first_child
+    next_sibling = tree.next_sibling
+    q = deque()
+    q.append(0)
+    while q:
+        node = q.popleft()
+        child = first_child[node]
+        while child != -1:
+            yield start[child], end[child]
+            q.append(child)
+            child = next_sibling[child]
+
+
+def traverse_tree(tree):
+    """Traverse tree and write all its edges, like traverse_tree() in "suffix_tree_v2.py" """
+    write_edges(_traverse_tree_level_order(tree), tree.text)
+
+
+def build_suffix_tree(text):
+    """
+    Build a suffix tree of the string text and return a list
+    with all of the labels of its edges (the corresponding
+    substrings of the text) in any order.
+    """
+    tree = build_tree(text)
+    traverse_tree(tree)
+
+
+if __name__ == '__main__':
+    text = sys.stdin.readline().strip()
+    build_suffix_tree(text)
@@ -0,0 +1,177 @@
+""" Generalized suffix tree of many documents, and listing of the documents that contain a pattern
+
+    A generalized suffix tree indexes all the suffixes of many documents at once. Textbook construction gives every
+    document a terminator of its own, so that no suffix of one document is a prefix of a suffix of another one.
+    With tens of thousands of documents, that's tens of thousands of new symbols, and the alphabet grows without limit.
+    Instead, we join the documents with one shared SEPARATOR into a single text, which ends with END:
+        documents[0] SEPARATOR documents[1] SEPARATOR ... documents[k] SEPARATOR END,
+    and build the suffix tree of that text, with leaf intervals, as SuffixTree from "suffix_tree_search.py".
+    The separators are effectively unique, because every one of them is at a different position in text, and the
+    suffix that starts after a separator is just a different suffix. A pattern that doesn't contain SEPARATOR
+    can't occur across the end of a document, so its occurrences in text are exactly its occurrences in documents.
+    Patterns that contain SEPARATOR or END occur in no document.
+    So, only two symbols are added to the alphabet, no matter how many documents there are.
+    Every leaf records the document and the offset in the document of its suffix, in arrays "documents" and "offsets",
+    which are indexed by the leaf's number in lexicographic order, like "leaves".
+
+    The occurrences of a pattern are the leaves in the leaf interval [l, r) of its locus. A document may occur there
+    many times, so listing the distinct documents by walking the interval would take time proportional to the number
+    of occurrences. Muthukrishnan's document listing takes time proportional to the number of documents instead.
+    Let previous[i] be the largest j < i such that documents[j] == documents[i], or -1 if there's no such j.
+    A document occurs in [l, r) if and only if its first occurrence there, i, has previous[i] < l.
+    The position m of the minimum of previous in [l, r) is such an occurrence, if previous[m] < l at all. Then we report
+    documents[m], and continue in [l, m) and [m + 1, r). Every such step reports a new document, or ends an interval.
+    The minimum is found in O(1) with a sparse table: level k holds the position of the minimum of every range of
+    length 2^k, and any range is covered by two such ranges. The table takes O(n log n) memory,
+    an integer of the tree's columns per entry.
+
+    Input: number of documents, the documents, number of patterns, and the patterns, one per line.
+    Output: for every pattern, the documents that contain it, in increasing order.
+"""
+
+import sys
+from array import array
+
+from suffix_tree_search import SuffixTree, _typecode, build_tree as build_search_tree
+
+SEPARATOR = '$'
+END = '#'
+
+
+class GeneralizedSuffixTree(SuffixTree):
+    """SuffixTree of documents joined with SEPARATOR, with the document and the offset of every leaf"""
+
+    def __init__(self, tree, document_starts, documents, offsets, previous, sparse_table):
+        super().__init__(tree.text, tree.start, tree.end, tree.leaf_start, tree.first_child, tree.next_sibling,
+                         tree.child_offset, tree.child_index, tree.leaf_low, tree.leaf_high, tree.leaves)
+        self.document_starts = document_starts
+        self.documents = documents
+        self.offsets = offsets
+        self.previous = previous
+        self.sparse_table = sparse_table
+
+    def count(self, pattern):
+        """Return number of occurrences of pattern in all the documents"""
+        if not pattern or SEPARATOR in pattern or END in pattern:
+            return 0
+        return super().count(pattern)
+
+    def find(self, pattern):
+        """Return list of (document, offset) of all occurrences of pattern in the documents"""
+        if not pattern or SEPARATOR in pattern or END in pattern:
+            return []
+        node = self.locus(pattern)
+        if node == -1:
+            return []
+        low = self.leaf_low[node]
+        high = self.leaf_high[node]
+        return list(zip(self.documents[low: high], self.offsets[low: high]))
+
+    def _minimum(self, low, high):
+        """Return position of the minimum of previous[low: high]"""
+        level = (high - low).bit_length() - 1
+        row = self.sparse_table[level]
+        left = row[low]
+        right = row[high - (1 << level)]
+        return left if self.previous[left] <= self.previous[right] else right
+
+    def list_documents(self, pattern, sort=False):
+        """Return the distinct documents that contain pattern, in the order in which they are found,
+           or in increasing order if sort is True
+
+           Sorting adds O(d log d) for d documents, so the query is only proportional to d without it.
+        """
+        if not pattern or SEPARATOR in pattern or END in pattern:
+            return []
+        node = self.locus(pattern)
+        if node == -1:
+            return []
+        low = self.leaf_low[node]
+        result = []
+        stack = [(low, self.leaf_high[node])]
+        while stack:
+            left, right = stack.pop()
+            if left >= right:
+                continue
+            m = self._minimum(left, right)
+            if self.previous[m] >= low:
+                continue
+            result.append(self.documents[m])
+            stack.append((left, m))
+            stack.append((m + 1, right))
+        if sort:
+            result.sort()
+        return result
+
+
+def _sparse_table(values, typecode):
+    """Return list of levels: level k holds position of the minimum of values[i: i + 2^k] at i"""
+    n = len(values)
+    table = [array(typecode, range(n))]
+    length = 1
+    while 2 * length <= n:
+        row = table[-1]
+        next_row = array(typecode, row[:n - 2 * length + 1])
+        for i in range(n - 2 * length + 1):
+            right = row[i + length]
+            if values[right] < values[next_row[i]]:
+                next_row[i] = right
+        table.append(next_row)
+        length *= 2
+    return table
+
+
+def build_tree(documents, stats=None):
+    """Build generalized suffix tree of documents and return it as a GeneralizedSuffixTree
+
+       stats, if given, is passed on to build_tree() in "suffix_tree_search.py".
+    """
+    if not documents:
+        raise ValueError("there must be at least one document")
+    for document in documents:
+        if SEPARATOR in document or END in document:
+            raise ValueError(f"documents must not contain {SEPARATOR!r} or {END!r}")
+    text = SEPARATOR.join(documents) + SEPARATOR + END
+    typecode = _typecode(text)
+
+    # Document of every position in text, and where every document starts. A separator belongs to the document
+    # that it ends, and END belongs to no document (-1).
+    document_of = array(typecode)
+    document_starts = array(typecode)
+    for document_id, document in enumerate(documents):
+        document_starts.append(len(document_of))
+        document_of.extend(array(typecode, [document_id]) * (len(document) + 1))
+    document_of.append(-1)
+    document_starts.append(len(document_of) - 1)
+
+    tree = build_search_tree(text, stats)
+    leaves = tree.leaves
+    documents_column = array(typecode, (document_of[position] for position in leaves))
+    offsets = array(typecode, (position - document_starts[document_of[position]] for position in leaves))
+
+    previous = array(typecode, [-1]) * len(leaves)
+    last = array(typecode, [-1]) * len(documents)
+    for i, document_id in enumerate(documents_column):
+        if document_id == -1:
+            previous[i] = i  # Never reported.
+        else:
+            previous[i] = last[document_id]
+            last[document_id] = i
+
+    return GeneralizedSuffixTree(tree, document_starts, documents_column, offsets, previous,
+                                 _sparse_table(previous, typecode))
+
+
+if __name__ == '__main__':
+    k = int(sys.stdin.readline().strip())
+    documents = []
+    for i in range(k):
+        documents.append(sys.stdin.readline().strip())
+    n = int(sys.stdin.readline().strip())
+    patterns = []
+    for i in range(n):
+        patterns.append(sys.stdin.readline().strip())
+
+    tree = build_tree(documents)
+    for pattern in patterns:
+        sys.stdout.write(' '.join(map(str, tree.list_documents(pattern, sort=True))) + '\n')
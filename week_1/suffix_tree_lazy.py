@@ -0,0 +1,185 @@
+""" Lazy suffix tree: write-only, top-down (WOTD) construction, one node at a time, when a query first needs it
+
+    Building the whole tree, like build_tree() in "suffix_tree_v2.py" or "suffix_tree_arrays.py" does, costs time
+    and memory for all of its nodes, while a query only walks one path from the root.
+    The WOTD algorithm of Giegerich, Kurtz and Stoye builds the tree top-down: a node is given the set of suffixes
+    that start with its path. Expanding the node means finding the longest common prefix of those suffixes,
+    which ends the edge that leads into the node, and partitioning them by the character that follows it.
+    Every part of the partition is a child. A set of one suffix is a leaf, and its edge goes to the end of text.
+    Since every node is expanded independently of its siblings, we can expand a node only when a query enters it.
+
+    The root is the only node that is expanded at construction: it's the partition of all suffixes
+    by their first character, which is O(n) bucketing. Then, locus() walks down from the root, comparing the pattern
+    with the text at the edges' offsets, and expands the nodes on the way, if they aren't expanded yet.
+    The occurrences of a pattern are simply the suffixes of its locus, so find() and count() don't go below it.
+
+    Expanded nodes are kept in an LRU cache, an OrderedDict keyed by (the first suffix of the node, the string depth
+    of its parent), which identifies a node. An expanded node holds the suffixes of its children, so its size
+    is its number of suffixes. When the total size exceeds cache_size, the least recently used nodes are evicted,
+    and they're expanded again when a query needs them. The root is never evicted. After every query, the nodes on
+    its path are marked as used from the bottom up, so that an ancestor is always evicted after its descendants.
+    Otherwise, the large nodes near the root would be evicted first, and every query would expand them again.
+    Expanding a node with k suffixes, whose edge is l characters long, takes O(k * l), so the worst case is a long
+    run of the same character, like for the naive algorithm.
+    The text must end with a unique character, like '$'.
+
+    If stats, a BuildStats from "suffix_tree_debug.py", is given, every expansion is counted into it, when it happens:
+    the characters compared while extending the common prefix, the children made by the partition, and the string
+    depth of the node. Nothing is split, as every edge gets its final length when its node is expanded.
+
+    Input is the same as in "trie_matching_extended.py": text, number of patterns, and the patterns,
+    and so is the output: all positions in text where one or more of the patterns occur.
+    Time to the first query is compared with the full construction in "suffix_tree_testing.py".
+"""
+
+import sys
+from array import array
+from collections import OrderedDict
+
+CACHE_SIZE = 1 << 24  # Number of suffixes, over all the expanded nodes in the cache.
+
+
+class LazySuffixTree:
+    """Suffix tree of text, whose nodes are expanded on demand, and kept in an LRU cache"""
+
+    def __init__(self, text, cache_size=CACHE_SIZE, stats=None):
+        self.text = text
+        self.typecode = 'i' if len(text) < 2**31 else 'q'
+        self.cache_size = cache_size
+        self.cache = OrderedDict()  # dict[tuple[int, int], tuple[int, dict[str, array]]]
+        self.cached = 0  # Number of suffixes in the cache.
+        self.expansions = 0
+        self.stats = stats
+        self.root = self._partition(range(len(text)), 0)  # Suffixes of the children of the root.
+        if stats is not None:
+            stats.record(nodes=1 + len(self.root))
+
+    def _partition(self, suffixes, depth):
+        """Return dict that maps every character to the suffixes that have it at offset depth"""
+        text = self.text
+        children = {}  # dict[str, array]
+        for suffix in suffixes:
+            char = text[suffix + depth]
+            if char not in children:
+                children[char] = array(self.typecode)
+            children[char].append(suffix)
+        return children
+
+    def _expand(self, suffixes, depth):
+        """Return (string depth, children) of the node with suffixes, whose parent has string depth depth
+
+           children maps the first character of the edge of every child to its suffixes, or is None for a leaf.
+        """
+        first = suffixes[0]
+        if len(suffixes) == 1:
+            return len(self.text) - first, None
+        key = (first, depth)
+        node = self.cache.get(key)
+        if node is not None:
+            self.cache.move_to_end(key)
+            return node
+
+        text = self.text
+        # All the suffixes share the first character of the edge, as they were partitioned by it.
+        depth += 1
+        while True:
+            char = text[first + depth]
+            if any(text[suffix + depth] != char for suffix in suffixes):
+                break
+            depth += 1
+        node = depth, self._partition(suffixes, depth)
+        if self.stats is not None:
+            self._count(suffixes, key[1] + 1, node)
+
+        self.expansions += 1
+        self.cache[key] = node
+        self.cached += len(suffixes)
+        while self.cached > self.cache_size and len(self.cache) > 1:
+            _, (_, evicted) = self.cache.popitem(last=False)
+            self.cached -= sum(len(child) for child in evicted.values())
+        return node
+
+    def _count(self, suffixes, start_depth, node):
+        """Count expansion of the node with suffixes into stats; the common prefix was extended from start_depth"""
+        text = self.text
+        depth, children = node
+        char = text[suffixes[0] + depth]
+        # Every row but the last one compared all the suffixes, and the last one stopped at the first mismatch.
+        last_row = next(k for k, suffix in enumerate(suffixes) if text[suffix + depth] != char) + 1
+        self.stats.record(comparisons=(depth - start_depth) * len(suffixes) + last_row, nodes=len(children),
+                          peak_depth=depth)
+
+    def locus(self, pattern):
+        """Return suffixes of the highest node whose path from the root starts with pattern, or None if there's none"""
+        text = self.text
+        pattern_length = len(pattern)
+        children = self.root
+        depth = 0
+        path = []  # Keys of the nodes on the way.
+        result = None
+        while True:
+            suffixes = children.get(pattern[depth])
+            if suffixes is None:
+                break
+            path.append((suffixes[0], depth))
+            node_depth, children = self._expand(suffixes, depth)
+            start = suffixes[0] + depth
+            length = min(node_depth, pattern_length) - depth
+            if text[start: start + length] != pattern[depth: depth + length]:
+                break
+            if node_depth >= pattern_length:
+                result = suffixes
+                break
+            if children is None:
+                break
+            depth = node_depth
+
+        # Ancestors become more recently used than their descendants, so that the nodes near the root, which are
+        # the largest and the most expensive to expand again, are evicted last.
+        cache = self.cache
+        for key in reversed(path):
+            if key in cache:
+                cache.move_to_end(key)
+        return result
+
+    def count(self, pattern):
+        """Return number of occurrences of pattern in text"""
+        if not pattern:
+            return len(self.text)
+        suffixes = self.locus(pattern)
+        return 0 if suffixes is None else len(suffixes)
+
+    def find(self, pattern):
+        """Return positions of all occurrences of pattern in text, in increasing order"""
+        if not pattern:
+            return array(self.typecode, range(len(self.text)))
+        suffixes = self.locus(pattern)
+        # A copy, because the suffixes of the locus are kept in the cache.
+        return array(self.typecode) if suffixes is None else array(self.typecode, suffixes)
+
+    def __contains__(self, pattern):
+        return not pattern or self.locus(pattern) is not None
+
+
+def solve(text, n, patterns):
+    tree = LazySuffixTree(text + '$')
+    result = set()
+    for pattern in patterns:
+        if pattern:
+            result.update(tree.find(pattern))
+    result = list(result)
+    result.sort()
+
+    return result
+
+
+if __name__ == '__main__':
+    text = sys.stdin.readline().strip()
+    n = int(sys.stdin.readline().strip())
+    patterns = []
+    for i in range(n):
+        patterns.append(sys.stdin.readline().strip())
+
+    ans = solve(text, n, patterns)
+
+    sys.stdout.write(' '.join(map(str, ans)) + '\n')
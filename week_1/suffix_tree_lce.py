@@ -0,0 +1,227 @@
+""" Lowest common ancestor (LCA) and longest common extension (LCE) queries on the suffix tree
+
+    LCE(i, j) is the length of the longest common prefix of the suffixes of text that begin at i and at j.
+    In the suffix tree, that's the string depth of the lowest common ancestor of the leaves of the two suffixes,
+    so with O(1) LCA queries, an LCE query doesn't compare any characters of text.
+
+    LCA is reduced to range minimum query (RMQ) over the Euler tour of the tree. The tour lists a node every time
+    the depth-first traversal enters it or returns to it, so it has 2 * (number of nodes) - 1 entries.
+    All nodes in the tour between the first visits of u and v are descendants of their LCA, or the LCA itself,
+    and the LCA is among them, so it's the node of the smallest string depth in that range. String depth is fine here,
+    instead of the usual depth in edges, because every edge has a non-empty label, so every node is strictly deeper
+    than its ancestors. Minimum is found on keys: key = string depth * (length of the tour) + position in the tour,
+    so the minimum key gives both the string depth (the LCE) and the position of the LCA in the tour.
+
+    RMQ is a block decomposition. The tour is cut into blocks of BLOCK entries, and for every position we keep the
+    minimum from the start of its block (prefix) and up to the end of its block (suffix). A sparse table over
+    the block minima answers the query for the whole blocks in between: level k holds the minimum of 2^k blocks
+    that begin at every block, and any range of blocks is covered by two such ranges. A range within one block
+    is scanned, which is at most BLOCK entries. So, a query is O(1), and the index takes O(n) memory,
+    as the sparse table only has (number of blocks) * log(number of blocks) entries.
+    Everything is built with NumPy in O(n), except for the Euler tour itself, which is one pass in Python.
+
+    The index works on the tree from "suffix_tree_v2.py" (or "suffix_tree_ukkonen.py"), on the tree built from
+    the suffix array and the LCP array by "suffix_tree_from_array.py" in weeks_3_4, or on the ArraySuffixTree
+    from "suffix_tree_arrays.py". In a tree of Node objects, leaf_start isn't used: in the tree from the suffix array,
+    it's the rank of the suffix instead of its position, and internal nodes have it too. A leaf is a node without
+    children, and its suffix begins at n - (its string depth), as every suffix ends with the last character of text.
+    lce_batch() and lca_batch() take NumPy arrays of suffix pairs, and answer all the queries at once,
+    with array operations.
+
+    Input: text, number of queries, and the queries, one pair of positions i j per line.
+    Output: LCE of every pair, one per line.
+"""
+
+import sys
+from array import array
+
+import numpy as np
+
+from suffix_tree_arrays import ArraySuffixTree, build_tree
+
+BLOCK = 16
+
+
+class LCEIndex:
+    """Euler tour of a suffix tree, with block RMQ over string depths of its nodes"""
+
+    def __init__(self, tour, depths, leaf_first, nodes=None):
+        self.tour = tour  # Node IDs, in the order of the Euler tour.
+        self.leaf_first = leaf_first  # leaf_first[i] is position in the tour of the leaf of the suffix at i.
+        self.nodes = nodes  # Nodes by their IDs, for trees of Node objects; None for an ArraySuffixTree.
+        m = len(tour)
+        self.size = m
+        blocks = -(-m // BLOCK)
+        keys = depths * m + np.arange(m, dtype=np.int64)
+        padded = np.full(blocks * BLOCK, np.iinfo(np.int64).max, dtype=np.int64)
+        padded[:m] = keys
+        self.keys = padded
+        rows = padded.reshape(blocks, BLOCK)
+        self.prefix = np.minimum.accumulate(rows, axis=1).ravel()
+        self.suffix = np.minimum.accumulate(rows[:, ::-1], axis=1)[:, ::-1].ravel()
+        table = [rows.min(axis=1)]
+        length = 1
+        while 2 * length <= blocks:
+            level = table[-1].copy()
+            np.minimum(level[:blocks - length], table[-1][length:], out=level[:blocks - length])
+            table.append(level)
+            length *= 2
+        self.table = np.stack(table)
+
+    def _minimum_key(self, low, high):
+        """Return the minimum key in the tour from low to high, inclusive"""
+        first_block = low // BLOCK
+        last_block = high // BLOCK
+        if first_block == last_block:
+            return int(self.keys[low: high + 1].min())
+        result = min(int(self.suffix[low]), int(self.prefix[high]))
+        if last_block - first_block > 1:
+            count = last_block - first_block - 1
+            level = count.bit_length() - 1
+            result = min(result, int(self.table[level, first_block + 1]),
+                         int(self.table[level, last_block - (1 << level)]))
+        return result
+
+    def _leaf_key(self, i, j):
+        low = self.leaf_first[i]
+        high = self.leaf_first[j]
+        if low > high:
+            low, high = high, low
+        return self._minimum_key(int(low), int(high))
+
+    def lce(self, i, j):
+        """Return length of the longest common prefix of the suffixes at positions i and j"""
+        return self._leaf_key(i, j) // self.size
+
+    def lca(self, i, j):
+        """Return the lowest common ancestor of the leaves of the suffixes at positions i and j"""
+        node = int(self.tour[self._leaf_key(i, j) % self.size])
+        return node if self.nodes is None else self.nodes[node]
+
+    def _minimum_keys(self, low, high):
+        """Return the minimum keys in the tour from low to high, inclusive, for arrays of ranges"""
+        first_block = low // BLOCK
+        last_block = high // BLOCK
+        result = np.minimum(self.suffix[low], self.prefix[high])
+
+        # Ranges within one block are scanned, all of them at once, as rows of BLOCK entries.
+        same = first_block == last_block
+        if same.any():
+            offsets = np.arange(BLOCK)
+            starts = low[same]
+            window = self.keys[np.minimum(starts[:, None] + offsets, len(self.keys) - 1)]
+            window[offsets > (high[same] - starts)[:, None]] = np.iinfo(np.int64).max
+            result[same] = window.min(axis=1)
+
+        inner = last_block - first_block - 1
+        between = inner > 0
+        if between.any():
+            count = inner[between]
+            level = np.frexp(count)[1] - 1
+            left = self.table[level, first_block[between] + 1]
+            right = self.table[level, last_block[between] - (1 << level)]
+            result[between] = np.minimum(result[between], np.minimum(left, right))
+        return result
+
+    def _leaf_keys(self, i, j):
+        first_i = self.leaf_first[np.asarray(i)]
+        first_j = self.leaf_first[np.asarray(j)]
+        return self._minimum_keys(np.minimum(first_i, first_j), np.maximum(first_i, first_j))
+
+    def lce_batch(self, i, j):
+        """Return NumPy array of LCE of every pair of suffixes, given as NumPy arrays i and j of their positions"""
+        return self._leaf_keys(i, j) // self.size
+
+    def lca_batch(self, i, j):
+        """Return NumPy array of IDs of the lowest common ancestors of the leaves of suffixes at i and j
+           (for trees of Node objects, the IDs index LCEIndex.nodes)
+        """
+        return self.tour[self._leaf_keys(i, j) % self.size]
+
+
+def _euler_tour_arrays(tree):
+    """Return (tour, string depths, positions of leaves in the tour) of an ArraySuffixTree"""
+    start = tree.start
+    end = tree.end
+    leaf_start = tree.leaf_start
+    first_child = tree.first_child
+    next_sibling = tree.next_sibling
+    tour = array('q', [0])
+    depths = array('q', [0])
+    leaf_first = array('q', [0]) * len(tree.text)
+    stack = [(0, 0, first_child[0])]  # (node, string depth, next child to visit)
+    while stack:
+        node, depth, child = stack[-1]
+        if child == -1:
+            stack.pop()
+            if stack:
+                tour.append(stack[-1][0])
+                depths.append(stack[-1][1])
+            continue
+        stack[-1] = (node, depth, next_sibling[child])
+        child_depth = depth + end[child] - start[child]
+        tour.append(child)
+        depths.append(child_depth)
+        if leaf_start[child] != -1:
+            leaf_first[leaf_start[child]] = len(tour) - 1
+            tour.append(node)
+            depths.append(depth)
+        else:
+            stack.append((child, child_depth, first_child[child]))
+    return tour, depths, leaf_first
+
+
+def _euler_tour_nodes(root):
+    """Return (tour, string depths, positions of leaves in the tour, nodes by their IDs) of a tree of Node objects"""
+    nodes = [root]
+    tour = array('q', [0])
+    depths = array('q', [0])
+    leaf_first = {}  # dict[int, int]: {string depth of the leaf: position in the tour}
+    stack = [(0, 0, iter(root.children.values()))]  # (node ID, string depth, iterator over children)
+    while stack:
+        node, depth, children = stack[-1]
+        child = next(children, None)
+        if child is None:
+            stack.pop()
+            if stack:
+                tour.append(stack[-1][0])
+                depths.append(stack[-1][1])
+            continue
+        child_id = len(nodes)
+        nodes.append(child)
+        child_depth = depth + child.end - child.start
+        tour.append(child_id)
+        depths.append(child_depth)
+        if not child.children:
+            leaf_first[child_depth] = len(tour) - 1
+            tour.append(node)
+            depths.append(depth)
+        else:
+            stack.append((child_id, child_depth, iter(child.children.values())))
+    # There is one leaf per suffix, so n is the number of leaves, and the suffix at i is the leaf of depth n - i.
+    n = len(leaf_first)
+    return tour, depths, array('q', (leaf_first[n - i] for i in range(n))), nodes
+
+
+def build_index(tree):
+    """Return LCEIndex of tree, which is an ArraySuffixTree or the root Node of a tree from "suffix_tree_v2.py"
+       or from "suffix_tree_from_array.py"
+    """
+    if isinstance(tree, ArraySuffixTree):
+        tour, depths, leaf_first = _euler_tour_arrays(tree)
+        nodes = None
+    else:
+        tour, depths, leaf_first, nodes = _euler_tour_nodes(tree)
+    return LCEIndex(np.frombuffer(tour, dtype=np.int64), np.frombuffer(depths, dtype=np.int64),
+                    np.frombuffer(leaf_first, dtype=np.int64), nodes)
+
+
+if __name__ == '__main__':
+    text = sys.stdin.readline().strip()
+    q = int(sys.stdin.readline().strip())
+    pairs = np.array([sys.stdin.readline().split() for _ in range(q)], dtype=np.int64).reshape(q, 2)
+
+    index = build_index(build_tree(text))
+    ans = index.lce_batch(pairs[:, 0], pairs[:, 1])
+
+    sys.stdout.write(''.join(f"{lce}\n" for lce in ans.tolist()))
@@ -0,0 +1,141 @@
+""" Binary on-disk format for the suffix tree, which is loaded with mmap
+
+    When the same reference text is indexed again and again, every process would otherwise build its tree
+    from scratch. Instead, we build the tree once, as SuffixTree from "suffix_tree_search.py", save it to a file,
+    and every process maps that file into memory. The columns of the loaded tree are memoryviews of the mapped file,
+    so loading doesn't create any per-node Python objects and doesn't even read the file. Pages are read from disk
+    on first access, so the first query can be answered right away, and all the processes that map the same file
+    share one copy of it in the page cache. This is the same idea as in "trie_mmap.py".
+
+    The file is made of a header and flat arrays, one after another:
+        header        - magic b"STRE", format version, byte order, size of an integer (4 or 8),
+                        number of nodes and length of text;
+        start, end, leaf_start, first_child, next_sibling - number of nodes integers each;
+        child_offset  - number of nodes + 1 integers;
+        child_index   - number of nodes - 1 integers;
+        leaf_low, leaf_high - number of nodes integers each;
+        leaves        - length of text integers;
+        text          - the text itself, one byte per character (Latin-1).
+    Integers come first, and the header takes 32 bytes, so that all of them are aligned to their size.
+    Integers are stored in the native byte order, so that they can be used without conversion.
+    A file that was written on a machine with a different byte order, or with another version, is rejected.
+
+    The text of the loaded tree is a memoryview of bytes, too, so a pattern is compared with it as bytes.
+    find(), count() and "in" take str patterns and encode them; edge labels are bytes.
+    find() returns a list rather than a view of the file, so that close() isn't blocked by views that are still alive.
+"""
+
+import mmap
+import struct
+import sys
+from timeit import default_timer as timer
+
+from suffix_tree_search import SuffixTree, _leaf_intervals, _typecode, build_tree
+
+MAGIC = b"STRE"
+VERSION = 1
+HEADER = struct.Struct("<4sIcBxxxxxxQQ")  # magic, version, byte order, integer size, (padding), nodes, text length
+
+COLUMNS = ("start", "end", "leaf_start", "first_child", "next_sibling", "child_offset", "child_index",
+           "leaf_low", "leaf_high", "leaves")
+
+
+class MappedSuffixTree(SuffixTree):
+    """SuffixTree whose columns and text are views of a memory-mapped file"""
+
+    def __init__(self, columns, text, mapping):
+        super().__init__(text, *columns)
+        self.mapping = mapping
+
+    def locus(self, pattern):
+        if isinstance(pattern, str):
+            try:
+                pattern = pattern.encode("latin-1")
+            except UnicodeEncodeError:
+                return -1
+        return super().locus(pattern)
+
+    def find(self, pattern):
+        """Return list of positions of all occurrences of pattern in text, in lexicographic order of their suffixes"""
+        occurrences = super().find(pattern)
+        result = occurrences.tolist()
+        occurrences.release()
+        return result
+
+    def close(self):
+        for name in COLUMNS:
+            getattr(self, name).release()
+        self.text.release()
+        self.mapping.close()
+
+
+def _column_sizes(nodes, text_length):
+    """Return number of integers in each of COLUMNS"""
+    return (nodes,) * 5 + (nodes + 1, nodes - 1, nodes, nodes, text_length)
+
+
+def save_tree(tree, path):
+    """Save suffix tree to a file at path
+
+       tree is an ArraySuffixTree or a SuffixTree; leaf intervals of an ArraySuffixTree are computed here.
+       Its text must be made of Latin-1 characters.
+    """
+    typecode = _typecode(tree.text)
+    if isinstance(tree, SuffixTree):
+        leaf_low, leaf_high, leaves = tree.leaf_low, tree.leaf_high, tree.leaves
+    else:
+        leaf_low, leaf_high, leaves = _leaf_intervals(tree, typecode)
+    columns = (tree.start, tree.end, tree.leaf_start, tree.first_child, tree.next_sibling,
+               tree.child_offset, tree.child_index, leaf_low, leaf_high, leaves)
+    byte_order = b"L" if sys.byteorder == "little" else b"B"
+    itemsize = 4 if typecode == 'i' else 8
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, byte_order, itemsize, len(tree), len(tree.text)))
+        for column in columns:
+            view = memoryview(column)
+            if view.itemsize != itemsize:
+                raise ValueError(f"all columns must have {itemsize} bytes per integer")
+            file.write(view.cast('B'))
+        file.write(tree.text.encode("latin-1"))
+
+
+def load_tree(path):
+    """Map the file at path, that was written by save_tree(), into memory and return it as a MappedSuffixTree"""
+    with open(path, "rb") as file:
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, byte_order, itemsize, nodes, text_length = HEADER.unpack_from(mapping)
+    if magic != MAGIC or version != VERSION:
+        mapping.close()
+        raise ValueError(f"{path} is not a suffix tree file of version {VERSION}")
+    if byte_order != (b"L" if sys.byteorder == "little" else b"B"):
+        mapping.close()
+        raise ValueError(f"{path} was written with a different byte order")
+
+    typecode = 'i' if itemsize == 4 else 'q'
+    view = memoryview(mapping)
+    offset = HEADER.size
+    columns = []
+    for size in _column_sizes(nodes, text_length):
+        columns.append(view[offset: offset + itemsize * size].cast(typecode))
+        offset += itemsize * size
+    text = view[offset: offset + text_length]
+    view.release()
+    return MappedSuffixTree(columns, text, mapping)
+
+
+if __name__ == '__main__':
+    # Usage: python3 suffix_tree_mmap.py tree.bin < input.txt
+    # Input is the same as in "suffix_tree.py". Builds the tree, saves it to "tree.bin", and then loads it back.
+    text = sys.stdin.readline().strip()
+
+    start = timer()
+    tree = build_tree(text)
+    end = timer()
+    print(f"Building the tree of {len(tree)} nodes took {end - start:.6f} s")
+    save_tree(tree, sys.argv[1])
+
+    start = timer()
+    tree = load_tree(sys.argv[1])
+    end = timer()
+    print(f"Loading the tree of {len(tree)} nodes took {end - start:.6f} s")
+    tree.close()
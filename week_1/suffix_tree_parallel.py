@@ -0,0 +1,364 @@
+""" Build suffix tree on many processes: suffixes are bucketed by their first k characters
+
+    Suffixes that start with different k-mers (substrings of length k) meet only in the top part of the suffix tree,
+    above string depth k. Below it, the subtree of every k-mer is independent of all the others, so the subtrees
+    can be built separately, on different processes, and then grafted under a small top tree.
+
+    * The main process buckets the positions of text by the k-mer that starts there. A suffix that is shorter than k,
+      or that has the terminating '$' among its first k characters, has a shorter key, which is unique.
+      The keys are prefix-free, because '$' only occurs at the end.
+    * The top tree is the compacted trie of the sorted keys. It's built with a stack in one pass over them,
+      like the tree in "suffix_tree_from_array.py" is built from the suffix array and the LCP array:
+      the LCP of neighbouring keys tells how far up the path of the previous key the next one branches off.
+      Its internal nodes are exactly the nodes of the suffix tree of string depth below k, and its leaves are
+      the roots of the subtrees of the buckets. A bucket of one suffix is just a leaf.
+    * Every other bucket is built in a worker process, write-only and top-down (WOTD, like in "suffix_tree_lazy.py"),
+      but eagerly: find the longest common prefix of the suffixes of a node, partition them by the next character,
+      and repeat for every part. A worker returns the columns of its subtree, like in "suffix_tree_arrays.py".
+    * The main process appends the columns of the subtrees to its own, with node IDs shifted,
+      and links the root of every subtree in place of the leaf of its key.
+    The result is an ArraySuffixTree, the same tree that build_tree() in "suffix_tree_arrays.py" returns,
+    except that the children of every node are in lexicographic order.
+
+    The text is put into shared memory (multiprocessing.shared_memory) once, as Latin-1 bytes. Workers attach to it
+    when they start, so it isn't copied to every worker, or pickled with every task. Only the positions
+    of the suffixes of a bucket are sent to a worker. The largest buckets go first, and there are about
+    BUCKETS_PER_WORKER buckets per worker, so that a large bucket doesn't keep the other workers idle at the end.
+    The number of workers and k can be given; by default, all the CPUs are used, and k is the smallest length
+    for which there are that many possible k-mers.
+
+    WOTD takes O(n * average depth of a leaf in nodes) on typical texts, and O(n^2) on long runs of the same character,
+    like the naive algorithm. benchmark() measures speedup against the single-process "suffix_tree_arrays.py".
+"""
+
+import os
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from math import ceil, log
+from multiprocessing import shared_memory
+from timeit import default_timer as timer
+
+from suffix_tree_arrays import ArraySuffixTree, _sorted_child_index, _typecode, build_tree as build_single, \
+    traverse_tree
+from suffix_tree_search import _leaf_intervals
+
+BUCKETS_PER_WORKER = 16
+
+_shared = None  # Set in each worker process by _init_worker().
+_text = None
+
+
+def _init_worker(name, length):
+    global _shared, _text
+    _shared = shared_memory.SharedMemory(name=name)
+    _text = _shared.buf[:length]
+
+
+def _build_subtree(text, suffixes, shared, typecode):
+    """Build subtree of the suffixes, which all share their first "shared" characters, with WOTD
+
+       Return (string depth of the root, start, end, leaf_start, first_child, next_sibling).
+       Node 0 is the root of the subtree, and its edge starts at the beginning of the suffixes.
+    """
+    n = len(text)
+    start = array(typecode)
+    end = array(typecode)
+    leaf_start = array(typecode)
+    first_child = array(typecode)
+    next_sibling = array(typecode)
+
+    def new_node():
+        start.append(0)
+        end.append(0)
+        leaf_start.append(-1)
+        first_child.append(-1)
+        next_sibling.append(-1)
+        return len(start) - 1
+
+    root_depth = None
+    stack = [(new_node(), suffixes, 0, shared)]  # (node, suffixes, depth of the parent, length of their LCP so far)
+    while stack:
+        node, group, depth, lcp = stack.pop()
+        first = group[0]
+        if len(group) == 1:
+            start[node] = first + depth
+            end[node] = n
+            leaf_start[node] = first
+            if root_depth is None:
+                root_depth = n - first
+            continue
+        while True:
+            char = text[first + lcp]
+            if any(text[suffix + lcp] != char for suffix in group):
+                break
+            lcp += 1
+        start[node] = first + depth
+        end[node] = first + lcp
+        if root_depth is None:
+            root_depth = lcp
+
+        children = {}  # dict[int, array]
+        for suffix in group:
+            char = text[suffix + lcp]
+            if char not in children:
+                children[char] = array(typecode)
+            children[char].append(suffix)
+        previous = -1
+        for char in sorted(children):
+            child = new_node()
+            if previous == -1:
+                first_child[node] = child
+            else:
+                next_sibling[previous] = child
+            previous = child
+            stack.append((child, children[char], lcp, lcp + 1))
+    return root_depth, start, end, leaf_start, first_child, next_sibling
+
+
+def _build_subtree_counted(text, suffixes, shared, typecode):
+    """Build subtree of the suffixes like _build_subtree(), and count the comparisons of characters
+       and the peak depth
+
+       Return ((comparisons, peak depth), subtree), where subtree is what _build_subtree() returns.
+    """
+    comparisons = 0
+    peak_depth = 0
+    n = len(text)
+    start = array(typecode)
+    end = array(typecode)
+    leaf_start = array(typecode)
+    first_child = array(typecode)
+    next_sibling = array(typecode)
+
+    def new_node():
+        start.append(0)
+        end.append(0)
+        leaf_start.append(-1)
+        first_child.append(-1)
+        next_sibling.append(-1)
+        return len(start) - 1
+
+    root_depth = None
+    stack = [(new_node(), suffixes, 0, shared)]  # (node, suffixes, depth of the parent, length of their LCP so far)
+    while stack:
+        node, group, depth, lcp = stack.pop()
+        first = group[0]
+        if len(group) == 1:
+            start[node] = first + depth
+            end[node] = n
+            leaf_start[node] = first
+            if root_depth is None:
+                root_depth = n - first
+            continue
+        lcp_start = lcp
+        while True:
+            char = text[first + lcp]
+            if any(text[suffix + lcp] != char for suffix in group):
+                break
+            lcp += 1
+        # Every row but the last one compared all the suffixes, and the last one stopped at the first mismatch.
+        last_row = next(k for k, suffix in enumerate(group) if text[suffix + lcp] != char) + 1
+        comparisons += (lcp - lcp_start) * len(group) + last_row
+        if lcp > peak_depth:
+            peak_depth = lcp
+        start[node] = first + depth
+        end[node] = first + lcp
+        if root_depth is None:
+            root_depth = lcp
+
+        children = {}  # dict[int, array]
+        for suffix in group:
+            char = text[suffix + lcp]
+            if char not in children:
+                children[char] = array(typecode)
+            children[char].append(suffix)
+        previous = -1
+        for char in sorted(children):
+            child = new_node()
+            if previous == -1:
+                first_child[node] = child
+            else:
+                next_sibling[previous] = child
+            previous = child
+            stack.append((child, children[char], lcp, lcp + 1))
+    return (comparisons, peak_depth), (root_depth, start, end, leaf_start, first_child, next_sibling)
+
+
+def _build_bucket(task):
+    suffixes, shared, typecode, counted = task
+    build = _build_subtree_counted if counted else _build_subtree
+    return build(_text, suffixes, shared, typecode)
+
+
+def _count_keys(keys):
+    """Return (comparisons, the largest LCP) of the neighbouring sorted keys, compared like for the top tree"""
+    comparisons = 0
+    peak_depth = 0
+    previous = b""
+    for key in keys:
+        lcp = 0
+        limit = min(len(key), len(previous))
+        while lcp < limit and key[lcp] == previous[lcp]:
+            lcp += 1
+        comparisons += lcp + 1 if lcp < limit else lcp
+        peak_depth = max(peak_depth, lcp)
+        previous = key
+    return comparisons, peak_depth
+
+
+def _prefix_length(text, workers):
+    """Return the smallest k, for which there are at least BUCKETS_PER_WORKER * workers possible k-mers"""
+    width = max(2, len(set(text)) - 1)  # Without '$'.
+    return max(1, ceil(log(BUCKETS_PER_WORKER * workers, width)))
+
+
+def build_tree(text, workers=None, k=None, stats=None):
+    """Build suffix tree from text on workers processes and return it as an ArraySuffixTree
+
+       If stats, a BuildStats from "suffix_tree_debug.py", is given, the workers build the subtrees with
+       _build_subtree_counted(), the comparisons of the keys are counted with _count_keys(), and the times
+       of the phases are measured. The top tree only compares keys, so that's all that it adds.
+    """
+    if workers is None:
+        workers = os.cpu_count()
+    if k is None:
+        k = _prefix_length(text, workers)
+    n = len(text)
+    typecode = _typecode(text)
+    data = text.encode("latin-1")
+    phase = nullcontext if stats is None else stats.phase
+
+    with phase("buckets"):
+        buckets = {}  # dict[bytes, array]
+        for i in range(n):
+            key = data[i: i + k]
+            if key not in buckets:
+                buckets[key] = array(typecode)
+            buckets[key].append(i)
+        keys = sorted(buckets)
+    if stats is not None:
+        comparisons, peak_depth = _count_keys(keys)
+
+    start = array(typecode, [0])
+    end = array(typecode, [0])
+    leaf_start = array(typecode, [-1])
+    first_child = array(typecode, [-1])
+    next_sibling = array(typecode, [-1])
+
+    def new_node(node_start, node_end, node_leaf_start):
+        start.append(node_start)
+        end.append(node_end)
+        leaf_start.append(node_leaf_start)
+        first_child.append(-1)
+        next_sibling.append(-1)
+        return len(start) - 1
+
+    # Top tree: compacted trie of the keys.
+    with phase("top tree"):
+        children = {0: []}  # dict[int, list[int]]: children of the nodes of the top tree, in lexicographic order
+        tasks = []  # (node, suffixes) of the buckets that are built by workers
+        stack = [(0, 0, 0)]  # (node, string depth, the first suffix below it)
+        previous = b""
+        for key in keys:
+            suffixes = buckets[key]
+            first = suffixes[0]
+            lcp = 0
+            limit = min(len(key), len(previous))
+            while lcp < limit and key[lcp] == previous[lcp]:
+                lcp += 1
+            last = None
+            while stack[-1][1] > lcp:
+                last = stack.pop()
+            parent, parent_depth, _ = stack[-1]
+            if parent_depth < lcp:
+                # The key branches off in the middle of the edge that leads into "last".
+                last_node, _, last_first = last
+                middle = new_node(last_first + parent_depth, last_first + lcp, -1)
+                children[parent][-1] = middle
+                children[middle] = [last_node]
+                start[last_node] = last_first + lcp
+                stack.append((middle, lcp, last_first))
+                parent, parent_depth = middle, lcp
+            if len(suffixes) == 1:
+                node = new_node(first + parent_depth, n, first)
+            else:
+                node = new_node(first + parent_depth, first + len(key), -1)
+                tasks.append((node, suffixes))
+            children[parent].append(node)
+            stack.append((node, len(key), first))
+            previous = key
+        for node, node_children in children.items():
+            first_child[node] = node_children[0]
+            for child, following in zip(node_children, node_children[1:]):
+                next_sibling[child] = following
+
+    # Subtrees of the buckets, the largest first.
+    with phase("subtrees"):
+        tasks.sort(key=lambda task: len(task[1]), reverse=True)
+        shared = shared_memory.SharedMemory(create=True, size=max(1, n))
+        try:
+            shared.buf[:n] = data
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(shared.name, n)) as executor:
+                counted = stats is not None
+                results = executor.map(_build_bucket, [(suffixes, k, typecode, counted) for _, suffixes in tasks])
+                for (node, suffixes), subtree in zip(tasks, results):
+                    if counted:
+                        (subtree_comparisons, subtree_peak_depth), subtree = subtree
+                        comparisons += subtree_comparisons
+                        peak_depth = max(peak_depth, subtree_peak_depth)
+                    root_depth, sub_start, sub_end, sub_leaf_start, sub_first_child, sub_next_sibling = subtree
+                    # Node i > 0 of the subtree becomes node i + shift, and its root is the node of the bucket.
+                    shift = len(start) - 1
+                    end[node] = suffixes[0] + root_depth
+                    first_child[node] = sub_first_child[0] + shift
+                    start.extend(sub_start[1:])
+                    end.extend(sub_end[1:])
+                    leaf_start.extend(sub_leaf_start[1:])
+                    first_child.extend(array(typecode, (c if c == -1 else c + shift for c in sub_first_child[1:])))
+                    next_sibling.extend(array(typecode, (c if c == -1 else c + shift for c in sub_next_sibling[1:])))
+        finally:
+            shared.close()
+            shared.unlink()
+
+    with phase("child index"):
+        child_offset, child_index = _sorted_child_index(text, start, first_child, next_sibling, typecode)
+    if stats is not None:
+        # There are n leaves, and every other internal node than the root is made by one split.
+        stats.record(comparisons, len(start) - n - 1, len(start), peak_depth)
+    return ArraySuffixTree(text, start, end, leaf_start, first_child, next_sibling, child_offset, child_index)
+
+
+def benchmark(text, max_workers=None):
+    """Print time and speedup of the parallel construction for 1, 2, 4, ... workers, against a single process"""
+    if max_workers is None:
+        max_workers = os.cpu_count()
+    typecode = _typecode(text)
+
+    start = timer()
+    expected = build_single(text)
+    end = timer()
+    single_time = end - start
+    expected_leaves = _leaf_intervals(expected, typecode)[2]
+    print(f"Single process: {single_time:.3f} s")
+
+    workers = 1
+    while True:
+        start = timer()
+        tree = build_tree(text, workers)
+        end = timer()
+        parallel_time = end - start
+        assert len(tree) == len(expected) and _leaf_intervals(tree, typecode)[2] == expected_leaves
+        print(f"{workers:3} workers: {parallel_time:.3f} s, speedup = {single_time / parallel_time:.2f}x, "
+              f"efficiency = {single_time / parallel_time / workers:.0%}")
+        if workers >= max_workers:
+            break
+        workers = min(2 * workers, max_workers)
+
+
+if __name__ == '__main__':
+    text = sys.stdin.readline().strip()
+    tree = build_tree(text)
+    traverse_tree(tree)
@@ -0,0 +1,112 @@
+""" Substring search in the suffix tree: find all occurrences of a pattern, and count them
+
+    A pattern occurs in text at position i if and only if it's a prefix of the suffix that begins at i,
+    so the occurrences of the pattern are exactly the leaves below its locus, the highest node whose path
+    from the root starts with the pattern. Finding the locus takes O(|pattern|) comparisons of characters,
+    which descend edges by comparing the pattern with the text at the edge's offsets, like ArraySuffixTree.locus().
+
+    To avoid walking the whole subtree of the locus for every query, we number the leaves once, in lexicographic
+    (depth-first, with children sorted by their first character) order. The leaves of every subtree then get
+    consecutive numbers, so each node carries its leaf interval [leaf_low, leaf_high), and its leaf count is
+    leaf_high - leaf_low. Array "leaves" lists leaf_start of the leaves in this order, which is the suffix array
+    of text. So, count() is O(|pattern|), and find() is O(|pattern| + number of occurrences), as it only slices
+    the suffix array. Both are methods of SuffixTree, which is an ArraySuffixTree from "suffix_tree_arrays.py"
+    with three more columns, so it takes 12 more bytes per node.
+
+    Input is the same as in "trie_matching_extended.py": text, number of patterns, and the patterns,
+    and so is the output: all positions in text where one or more of the patterns occur.
+"""
+
+import sys
+from array import array
+from contextlib import nullcontext
+
+from suffix_tree_arrays import ArraySuffixTree, _typecode, build_tree as build_array_tree
+
+
+class SuffixTree(ArraySuffixTree):
+    """ArraySuffixTree with the leaf interval of every node, and the suffix array of text"""
+
+    def __init__(self, text, start, end, leaf_start, first_child, next_sibling, child_offset, child_index,
+                 leaf_low, leaf_high, leaves):
+        super().__init__(text, start, end, leaf_start, first_child, next_sibling, child_offset, child_index)
+        self.leaf_low = leaf_low
+        self.leaf_high = leaf_high
+        self.leaves = leaves
+
+    def count(self, pattern):
+        """Return number of occurrences of pattern in text"""
+        node = self.locus(pattern)
+        if node == -1:
+            return 0
+        return self.leaf_high[node] - self.leaf_low[node]
+
+    def find(self, pattern):
+        """Return positions of all occurrences of pattern in text, in lexicographic order of their suffixes"""
+        node = self.locus(pattern)
+        if node == -1:
+            return self.leaves[0:0]
+        return self.leaves[self.leaf_low[node]: self.leaf_high[node]]
+
+
+def _leaf_intervals(tree, typecode):
+    """Return (leaf_low, leaf_high, leaves) of ArraySuffixTree tree"""
+    nodes = len(tree)
+    leaf_start = tree.leaf_start
+    child_offset = tree.child_offset
+    child_index = tree.child_index
+    leaf_low = array(typecode, [0]) * nodes
+    leaf_high = array(typecode, [0]) * nodes
+    leaves = array(typecode)
+    stack = [0]
+    while stack:
+        node = stack.pop()
+        if node < 0:
+            leaf_high[~node] = len(leaves)
+            continue
+        leaf_low[node] = len(leaves)
+        if leaf_start[node] != -1:
+            leaves.append(leaf_start[node])
+            leaf_high[node] = len(leaves)
+            continue
+        stack.append(~node)
+        # Children are pushed in reverse, so that they are popped in lexicographic order.
+        stack.extend(reversed(child_index[child_offset[node]: child_offset[node + 1]]))
+    return leaf_low, leaf_high, leaves
+
+
+def build_tree(text, stats=None):
+    """Build suffix tree from text, with leaf intervals, and return it as a SuffixTree
+
+       stats, if given, is passed on to build_tree() in "suffix_tree_arrays.py", and the leaf intervals are a phase.
+    """
+    tree = build_array_tree(text, stats)
+    phase = nullcontext if stats is None else stats.phase
+    with phase("leaf intervals"):
+        leaf_low, leaf_high, leaves = _leaf_intervals(tree, _typecode(text))
+    return SuffixTree(text, tree.start, tree.end, tree.leaf_start, tree.first_child, tree.next_sibling,
+                      tree.child_offset, tree.child_index, leaf_low, leaf_high, leaves)
+
+
+def solve(text, n, patterns):
+    tree = build_tree(text + '$')
+    result = set()
+    for pattern in patterns:
+        if pattern:
+            result.update(tree.find(pattern))
+    result = list(result)
+    result.sort()
+
+    return result
+
+
+if __name__ == '__main__':
+    text = sys.stdin.readline().strip()
+    n = int(sys.stdin.readline().strip())
+    patterns = []
+    for i in range(n):
+        patterns.append(sys.stdin.readline().strip())
+
+    ans = solve(text, n, patterns)
+
+    sys.stdout.write(' '.join(map(str, ans)) + '\n')
@@ -0,0 +1,188 @@
+""" Test and compare various implementations of the suffix tree to one another """
+import os
+import sys
+import tracemalloc
+from collections import deque
+from datetime import timedelta
+from random import choices, randrange
+from timeit import default_timer as timer
+
+import suffix_tree_arrays
+import suffix_tree_debug
+import suffix_tree_lazy
+import suffix_tree_lce
+import suffix_tree_parallel
+import suffix_tree_search
+import suffix_tree_ukkonen
+import suffix_tree_v2
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "weeks_3_4"))
+import suffix_tree_from_array  # noqa: E402
+
+
+"""
+The naive algorithm is O(n^2) in the worst case, and long runs of the same character are that case.
+Ukkonen's algorithm is O(n) on any text. Both trees must give exactly the same edges, in the same order.
+The naive algorithm is only run up to NAIVE_MAX_LENGTH, and Ukkonen's up to MAX_LENGTH.
+Ukkonen's tree of a random DNA text of length 10**6 takes about 700 MB, and building it takes about 20 s,
+so MAX_LENGTH = 10**7 needs about 7 GB of memory and a few minutes.
+The tree stored in flat arrays, from "suffix_tree_arrays.py", takes about 10 times less memory than the tree of
+Node objects, e.g., about 45 MB instead of about 430 MB for a random DNA text of length 10**6.
+Memory is measured with tracemalloc, at MEMORY_LENGTH, because tracemalloc makes building several times slower.
+The lazy tree from "suffix_tree_lazy.py" answers its first query after O(n) bucketing, instead of after
+the full construction; both times are compared at LAZY_LENGTH.
+The parallel build from "suffix_tree_parallel.py" is compared with "suffix_tree_arrays.py" at PARALLEL_LENGTH,
+for 1, 2, 4, ... workers, up to the number of CPUs.
+Counters from "suffix_tree_debug.py" show where the time goes, at STATS_LENGTH: a run of 'A' has a repeat
+as long as the text, so the naive algorithm compares about n^2 / 2 characters, while Ukkonen's compares about 2n.
+The tree of Node objects and the tree in flat arrays are built by the same steps, so their counters must be the same.
+LCE queries from "suffix_tree_lce.py" are checked against comparing the suffixes character by character, at LCE_LENGTH,
+on the naive tree, on the tree in flat arrays, and on the tree built from the suffix array in weeks_3_4.
+"""
+
+
+ALPHABET = ('A', 'C', 'G', 'T')
+NAIVE_MAX_LENGTH = 10**4
+MAX_LENGTH = 10**7
+MEMORY_LENGTH = 10**5
+LAZY_LENGTH = 10**6
+PARALLEL_LENGTH = 10**6
+STATS_LENGTH = 10**4
+LCE_LENGTH = 10**4
+LCE_QUERIES = 10**4
+
+
+def generate_text(length):
+    text = choices(population=ALPHABET, k=length - 1)
+    return "".join(text) + '$'
+
+
+def generate_run(length):
+    return 'A' * (length - 1) + '$'
+
+
+def edges(tree, text):
+    """Return list of all edge labels, in the order in which traverse_tree() writes them"""
+    result = []
+    q = deque(tree.children.values())
+    while q:
+        node = q.popleft()
+        result.append(text[node.start: node.end])
+        q.extend(node.children.values())
+    return result
+
+
+def array_edges(tree):
+    """Return list of all edge labels of ArraySuffixTree tree, in the order in which traverse_tree() writes them"""
+    result = []
+    q = deque([0])
+    while q:
+        node = q.popleft()
+        for child in tree.children(node):
+            result.append(tree.label(child))
+            q.append(child)
+    return result
+
+
+def measure(build, text):
+    start = timer()
+    tree = build(text)
+    end = timer()
+    return tree, end - start
+
+
+def compare(text, name):
+    naive, naive_time = measure(suffix_tree_v2.build_tree, text)
+    ukkonen, ukkonen_time = measure(suffix_tree_ukkonen.build_tree, text)
+    arrays, arrays_time = measure(suffix_tree_arrays.build_tree, text)
+    print(f"{name} of length {len(text)}: Naive took {naive_time:.3f} s, Ukkonen took {ukkonen_time:.3f} s, "
+          f"Arrays took {arrays_time:.3f} s")
+    assert edges(naive, text) == edges(ukkonen, text) == array_edges(arrays)
+
+
+def measure_memory(build, text):
+    """Return (number of nodes, bytes taken by the tree, peak bytes while building)"""
+    tracemalloc.start()
+    tree = build(text)
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    nodes = len(tree) if isinstance(tree, suffix_tree_arrays.ArraySuffixTree) else len(edges(tree, text)) + 1
+    return nodes, size, peak
+
+
+def compare_memory(length):
+    for name, generate in (("Random text", generate_text), ("Run of 'A'", generate_run)):
+        text = generate(length)
+        for build_name, build in (("Nodes", suffix_tree_ukkonen.build_tree), ("Arrays", suffix_tree_arrays.build_tree)):
+            nodes, size, peak = measure_memory(build, text)
+            print(f"{build_name}, {name} of length {length}: {nodes} nodes, {size / 2**20:.1f} MB "
+                  f"({size / nodes:.1f} bytes per node), peak {peak / 2**20:.1f} MB")
+
+
+def compare_lazy(length):
+    text = generate_text(length)
+    pattern = text[length // 2: length // 2 + 12]
+    for name, build in (("Full", suffix_tree_search.build_tree), ("Lazy", suffix_tree_lazy.LazySuffixTree)):
+        start = timer()
+        tree = build(text)
+        built = timer()
+        count = tree.count(pattern)
+        end = timer()
+        print(f"{name}, Random text of length {length}: building took {built - start:.3f} s, "
+              f"the first query took {end - built:.3f} s, {end - start:.3f} s in total ({count} occurrences)")
+
+
+def compare_stats(length):
+    for name, generate in (("Random text", generate_text), ("Run of 'A'", generate_run)):
+        text = generate(length)
+        counters = {}
+        for algorithm, build in (("Naive", suffix_tree_v2.build_tree), ("Ukkonen", suffix_tree_ukkonen.build_tree),
+                                 ("Arrays", suffix_tree_arrays.build_tree)):
+            with suffix_tree_debug.BuildStats() as stats:
+                build(text, stats)
+            counters[algorithm] = stats.comparisons, stats.splits, stats.nodes, stats.peak_depth
+            print(f"{algorithm}, {name} of length {length}: {stats}")
+        assert counters["Ukkonen"] == counters["Arrays"]
+
+
+def compare_lce(length, queries):
+    for name, generate in (("Random text", generate_text), ("Run of 'A'", generate_run)):
+        text = generate(length)
+        pairs = [(randrange(length), randrange(length)) for _ in range(queries)]
+        expected = [len(os.path.commonprefix((text[i:], text[j:]))) for i, j in pairs]
+        for tree_name, build in (("Naive", suffix_tree_v2.build_tree), ("Arrays", suffix_tree_arrays.build_tree),
+                                 ("From suffix array", suffix_tree_from_array.text_to_suffix_tree)):
+            index, execution_time = measure(lambda t: suffix_tree_lce.build_index(build(t)), text)
+            assert [index.lce(i, j) for i, j in pairs] == expected
+            print(f"{tree_name}, {name} of length {length}: building the tree and the index took "
+                  f"{execution_time:.3f} s, {queries} LCE queries are correct")
+
+
+def scale():
+    length = 10**3
+    while length <= MAX_LENGTH:
+        for name, generate in (("Random text", generate_text), ("Run of 'A'", generate_run)):
+            _, execution_time = measure(suffix_tree_ukkonen.build_tree, generate(length))
+            print(f"Ukkonen, {name} of length {length}: {execution_time:.3f} s [{timedelta(seconds=execution_time)}], "
+                  f"{execution_time / length * 10**6:.2f} µs per character")
+        length *= 10
+
+
+if __name__ == '__main__':
+    length = 10**2
+    while length <= NAIVE_MAX_LENGTH:
+        compare(generate_text(length), "Random text")
+        compare(generate_run(length), "Run of 'A'")
+        length *= 10
+    print()
+    compare_memory(MEMORY_LENGTH)
+    print()
+    compare_stats(STATS_LENGTH)
+    print()
+    compare_lce(LCE_LENGTH, LCE_QUERIES)
+    print()
+    compare_lazy(LAZY_LENGTH)
+    print()
+    suffix_tree_parallel.benchmark(generate_text(PARALLEL_LENGTH))
+    print()
+    scale()
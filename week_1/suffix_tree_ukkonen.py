@@ -0,0 +1,223 @@
+""" Build suffix tree in linear time, with Ukkonen's algorithm
+
+    "suffix_tree.py" and "suffix_tree_v2.py" insert every suffix from the root, and compare characters one by one,
+    which is O(n^2) in the worst case, e.g., for long runs of the same character.
+    Here we build the very same tree, made of the same Node objects from "suffix_tree_v2.py", in O(n), online,
+    one character of text at a time. The text must end with a unique character, like '$'.
+
+    Ukkonen's algorithm keeps the tree of all suffixes of the text read so far, with three tricks:
+    * Leaves are open - their end is the current end of the text, so all of them grow at once, in O(1).
+      We keep end = None for leaves while building, and set it to len(text) at the end.
+    * Active point (active node, active edge, active length) tells where the next suffix to be inserted ends.
+      "remainder" is the number of suffixes that still need to be inserted explicitly. When the current character
+      already follows the active point, all the remaining suffixes are implicitly in the tree, and we move on.
+    * Suffix links - an internal node with path "xα" links to the internal node with path "α",
+      so after inserting a suffix, we jump to the place of the next (shorter) suffix instead of going from the root.
+    Suffix links are kept in a dictionary, so that Node is the same as in "suffix_tree_v2.py".
+
+    The tree from the naive algorithm is not only the same tree. Its nodes also have the same start and end
+    positions, and children in the same order, which is the order in which traversal writes edges.
+    In the naive tree, the label of an edge starts at the first occurrence in text of the path to its lower node,
+    i.e., start = (the smallest leaf_start in the subtree) + (string depth of the parent).
+    Children of the root are ordered by their smallest leaf_start. An internal node is created by the split that
+    inserts the second smallest leaf_start in its subtree, and the new leaf is inserted into it before the old
+    edge, while all the later children are appended in the order of their smallest leaf_start.
+    Ukkonen's algorithm inserts suffixes in the same order, but it may choose different positions for the labels,
+    and it inserts children in a different order, so one more O(n) pass puts them right.
+
+    Scaling is measured in "suffix_tree_testing.py", from 10^3 up to 10^7 characters.
+"""
+
+import gc
+import sys
+from contextlib import nullcontext
+
+from suffix_tree_v2 import Node, traverse_tree
+
+
+def _build_tree_ukkonen(text):
+    """Build suffix tree of text with Ukkonen's algorithm and return it, with end = None in all the leaves"""
+    root = Node()
+    suffix_link = {}  # dict[Node, Node]
+    active_node = root
+    active_edge = 0  # Position in text of the first character of the active edge.
+    active_length = 0
+    remainder = 0
+    for i, char in enumerate(text):
+        remainder += 1
+        last_internal = None
+        while remainder > 0:
+            if active_length == 0:
+                active_edge = i
+            next_node = active_node.children.get(text[active_edge])
+            if next_node is None:
+                active_node.children[text[active_edge]] = Node(start=i, end=None, leaf_start=i - remainder + 1)
+                if last_internal is not None:
+                    suffix_link[last_internal] = active_node
+                    last_internal = None
+            else:
+                edge_length = (i + 1 if next_node.end is None else next_node.end) - next_node.start
+                if active_length >= edge_length:
+                    active_edge += edge_length
+                    active_length -= edge_length
+                    active_node = next_node
+                    continue
+                if text[next_node.start + active_length] == char:
+                    if last_internal is not None:
+                        suffix_link[last_internal] = active_node
+                    active_length += 1
+                    break
+                split = Node(start=next_node.start, end=next_node.start + active_length)
+                active_node.children[text[active_edge]] = split
+                split.children[char] = Node(start=i, end=None, leaf_start=i - remainder + 1)
+                next_node.start += active_length
+                split.children[text[next_node.start]] = next_node
+                if last_internal is not None:
+                    suffix_link[last_internal] = split
+                last_internal = split
+            remainder -= 1
+            if active_node is root and active_length > 0:
+                active_length -= 1
+                active_edge = i - remainder + 1
+            elif active_node is not root:
+                active_node = suffix_link.get(active_node, root)
+    return root
+
+
+def _build_tree_ukkonen_counted(text, stats):
+    """Build suffix tree of text like _build_tree_ukkonen(), count the comparisons of characters, the splits,
+       the nodes and the peak depth into stats, and return it
+    """
+    comparisons = 0
+    splits = 0
+    nodes = 1
+    peak_remainder = 0
+    root = Node()
+    suffix_link = {}  # dict[Node, Node]
+    active_node = root
+    active_edge = 0  # Position in text of the first character of the active edge.
+    active_length = 0
+    remainder = 0
+    for i, char in enumerate(text):
+        remainder += 1
+        last_internal = None
+        while remainder > 0:
+            if active_length == 0:
+                active_edge = i
+            next_node = active_node.children.get(text[active_edge])
+            if next_node is None:
+                active_node.children[text[active_edge]] = Node(start=i, end=None, leaf_start=i - remainder + 1)
+                nodes += 1
+                if remainder > peak_remainder:
+                    peak_remainder = remainder
+                if last_internal is not None:
+                    suffix_link[last_internal] = active_node
+                    last_internal = None
+            else:
+                edge_length = (i + 1 if next_node.end is None else next_node.end) - next_node.start
+                if active_length >= edge_length:
+                    active_edge += edge_length
+                    active_length -= edge_length
+                    active_node = next_node
+                    continue
+                comparisons += 1
+                if text[next_node.start + active_length] == char:
+                    if last_internal is not None:
+                        suffix_link[last_internal] = active_node
+                    active_length += 1
+                    break
+                split = Node(start=next_node.start, end=next_node.start + active_length)
+                active_node.children[text[active_edge]] = split
+                split.children[char] = Node(start=i, end=None, leaf_start=i - remainder + 1)
+                next_node.start += active_length
+                split.children[text[next_node.start]] = next_node
+                splits += 1
+                nodes += 2
+                if remainder > peak_remainder:
+                    peak_remainder = remainder
+                if last_internal is not None:
+                    suffix_link[last_internal] = split
+                last_internal = split
+            remainder -= 1
+            if active_node is root and active_length > 0:
+                active_length -= 1
+                active_edge = i - remainder + 1
+            elif active_node is not root:
+                active_node = suffix_link.get(active_node, root)
+    # The suffix that is inserted with remainder r has its first r - 1 characters in the tree already.
+    stats.record(comparisons, splits, nodes, max(peak_remainder - 1, 0))
+    return root
+
+
+def _normalize(tree, text):
+    """Close the leaves, and set edge positions and order of children the way the naive algorithm does"""
+    length = len(text)
+    depth = {tree: 0}  # dict[Node, int]: string depth
+    smallest = {}  # dict[Node, int]: the smallest leaf_start in the subtree
+
+    # Iterative post-order, to find the smallest leaf_start in every subtree.
+    stack = [(tree, False)]
+    while stack:
+        node, visited = stack.pop()
+        if node.leaf_start is not None:
+            node.end = length
+            smallest[node] = node.leaf_start
+        elif visited:
+            smallest[node] = min(smallest[child] for child in node.children.values())
+        else:
+            stack.append((node, True))
+            for child in node.children.values():
+                depth[child] = depth[node] + (length if child.end is None else child.end) - child.start
+                stack.append((child, False))
+
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        children = sorted(node.children.values(), key=smallest.get)
+        if node is not tree:
+            children[0], children[1] = children[1], children[0]
+        node.children = {}
+        for child in children:
+            child.start = smallest[child] + depth[node]
+            child.end = smallest[child] + depth[child] if child.leaf_start is None else length
+            node.children[text[child.start]] = child
+            if child.leaf_start is None:
+                stack.append(child)
+
+
+def build_tree(text, stats=None):
+    """Build suffix tree from text and return it
+
+       If stats, a BuildStats from "suffix_tree_debug.py", is given, the tree is built by
+       _build_tree_ukkonen_counted(), which counts the construction into it, and the times of the phases
+       are measured.
+    """
+    # The tree has no reference cycles, so there's no need for the garbage collector to keep scanning
+    # the millions of new nodes while we're building it. Without this, building is about 1.5 times slower.
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    phase = nullcontext if stats is None else stats.phase
+    try:
+        with phase("ukkonen"):
+            tree = _build_tree_ukkonen(text) if stats is None else _build_tree_ukkonen_counted(text, stats)
+        with phase("normalize"):
+            _normalize(tree, text)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return tree
+
+
+def build_suffix_tree(text):
+    """
+    Build a suffix tree of the string text and return a list
+    with all of the labels of its edges (the corresponding
+    substrings of the text) in any order.
+    """
+    tree = build_tree(text)
+    traverse_tree(tree, text)
+
+
+if __name__ == '__main__':
+    text = sys.stdin.readline().strip()
+    build_suffix_tree(text)
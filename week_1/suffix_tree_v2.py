@@ -21,11 +21,18 @@
     The comparison order becomes important when we want to create a Suffix Array from a Suffix Tree.
     Still, that problem is solvable externally to the tree.
 
+    Traversal yields (start, end) positions of the edges, instead of printing their labels one by one.
+    write_edges() joins the labels into large buffers and writes them to the binary stdout,
+    because for trees with millions of edges one print() per edge took more time than building the tree.
+
     The modification in v2 is that it uses Node.end instead of Node.length.
 """
 
 import sys
 from collections import deque
+from itertools import islice, starmap
+
+BUFFER_EDGES = 1 << 16  # Number of edges that are written at once.
 
 
 class Node:
@@ -41,8 +48,61 @@ class Node:
         self.leaf_start = leaf_start
 
 
-def build_tree(text):
-    """Build suffix tree from text and return it"""
+def build_tree(text, stats=None):
+    """Build suffix tree from text and return it
+
+       If stats, a BuildStats from "suffix_tree_debug.py", is given, the tree is built by _build_tree_counted(),
+       which counts the construction into it, so that this loop doesn't pay for the counters.
+    """
+    if stats is not None:
+        return _build_tree_counted(text, stats)
+    suffix_length = 1 + len(text)
+    root = Node()
+    for i in range(len(text)):
+        suffix = text[i:]
+        suffix_length -= 1
+        current = root
+        j = 0
+        while j < suffix_length:
+            try:
+                next_node = current.children[suffix[j]]
+            except KeyError:
+                start = i + j
+                end = i + suffix_length
+                new_leaf = Node(start=start, end=end, leaf_start=i)
+                current.children[suffix[j]] = new_leaf
+                j = end  # break
+            else:
+                overlap = 0
+                nn_start = next_node.start
+                while suffix[j + overlap] == text[nn_start + overlap] and nn_start + overlap < next_node.end:
+                    overlap += 1
+                if nn_start + overlap == next_node.end:
+                    current = next_node
+                    j += overlap
+                else:
+                    ni_start = next_node.start
+                    ni_end = ni_start + overlap
+                    new_internal = Node(start=ni_start, end=ni_end)
+                    nl_start = i + j + overlap
+                    nl_end = i + suffix_length
+                    new_leaf = Node(start=nl_start, end=nl_end, leaf_start=i)
+                    next_node.start += overlap
+                    new_internal.children[text[nl_start]] = new_leaf
+                    new_internal.children[text[next_node.start]] = next_node
+                    current.children[text[ni_start]] = new_internal
+                    break
+    return root
+
+
+def _build_tree_counted(text, stats):
+    """Build suffix tree from text like build_tree(), count the comparisons of characters, the splits,
+       the nodes and the peak depth into stats, and return it
+    """
+    comparisons = 0
+    splits = 0
+    nodes = 1
+    peak_depth = 0
     suffix_length = 1 + len(text)
     root = Node()
     for i in range(len(text)):
@@ -58,12 +118,16 @@ def build_tree(text):
                 end = i + suffix_length
                 new_leaf = Node(start=start, end=end, leaf_start=i)
                 current.children[suffix[j]] = new_leaf
+                nodes += 1
+                if j > peak_depth:
+                    peak_depth = j
                 j = end  # break
             else:
                 overlap = 0
                 nn_start = next_node.start
                 while suffix[j + overlap] == text[nn_start + overlap] and nn_start + overlap < next_node.end:
                     overlap += 1
+                comparisons += overlap + 1  # The last comparison is the one that stopped the loop.
                 if nn_start + overlap == next_node.end:
                     current = next_node
                     j += overlap
@@ -78,62 +142,86 @@ def build_tree(text):
                     new_internal.children[text[nl_start]] = new_leaf
                     new_internal.children[text[next_node.start]] = next_node
                     current.children[text[ni_start]] = new_internal
+                    splits += 1
+                    nodes += 2
+                    if j + overlap > peak_depth:
+                        peak_depth = j + overlap
                     break
+    stats.record(comparisons, splits, nodes, peak_depth)
     return root
 
 
-def _traverse_tree_recursive(tree, text):
+def _traverse_tree_recursive(tree):
 
-    def traverse(node, text):
+    def traverse(node):
         """Pre-order"""
         if node is None:
             return
-        print(text[node.start: node.end])  # Visit.
+        yield node.start, node.end  # Visit.
         for child in node.children.values():
-            traverse(child, text)
+            yield from traverse(child)
 
     for child in tree.children.values():
-        traverse(child, text)
+        yield from traverse(child)
 
 
-def _traverse_tree_level_order(tree, text):
+def _traverse_tree_level_order(tree):
     q = deque()
     for child in tree.children.values():
         q.append(child)
     while q:
         node = q.popleft()
-        print(text[node.start: node.end])
+        yield node.start, node.end
         for child in node.children.values():
             q.append(child)
 
 
-def _traverse_tree_dfs_(tree, text):
+def _traverse_tree_dfs_(tree):
     stack = list()
     for child in tree.children.values():
         stack.append(child)
     while stack:
         node = stack.pop()
-        print(text[node.start: node.end])
+        yield node.start, node.end
         for child in node.children.values():
             stack.append(child)
 
 
-def _traverse_tree_dfs(tree, text):
+def _traverse_tree_dfs(tree):
     stack = list()
     stack.append(tree)
     while stack:
         node = stack.pop()
         for child in node.children.values():
-            print(text[child.start: child.end])
+            yield child.start, child.end
             stack.append(child)
 
 
+def write_edges(edges, text, output=None):
+    """Write labels of edges, given as (start, end) pairs, to output, one per line
+
+       Labels of BUFFER_EDGES edges at a time are sliced and joined into one buffer, which is written at once,
+       instead of one print() per edge. By default, output is the binary stdout.
+    """
+    if output is None:
+        sys.stdout.flush()
+        output = sys.stdout.buffer
+    edges = iter(edges)
+    while True:
+        chunk = list(islice(edges, BUFFER_EDGES))
+        if not chunk:
+            break
+        labels = map(text.__getitem__, starmap(slice, chunk))
+        output.write(("\n".join(labels) + "\n").encode())
+    output.flush()
+
+
 def traverse_tree(tree, text):
-    """Traverse tree and return all its edges using text"""
+    """Traverse tree and write all its edges using text"""
     # We are not printing root!
     if tree is None:
         return
-    _traverse_tree_level_order(tree, text)
+    write_edges(_traverse_tree_level_order(tree), text)
 
 
 def build_suffix_tree(text):
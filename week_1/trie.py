@@ -39,6 +39,35 @@ def build_trie(patterns):
     return trie
 
 
+def build_trie_sorted(patterns):
+    """Return the same trie as build_trie(), built in one pass over the sorted patterns
+
+       A pattern shares its longest common prefix (LCP) with the pattern right before it in sorted order,
+       so we keep the path of nodes of the previous pattern, cut it at the LCP, and only add the rest of the pattern,
+       without looking up any of the shared symbols. Nodes get their labels in depth-first order, so they differ
+       from build_trie(), but the edges spell the same strings. "trie_array.py" has the same function for ArrayTrie.
+    """
+    trie = {0: dict()}
+    path = [trie[0]]  # Nodes on the path of the previous pattern; path[d] is at depth d.
+    previous = ""
+    new_node_label = 1
+    for pattern in sorted(patterns):
+        lcp = 0
+        limit = min(len(pattern), len(previous))
+        while lcp < limit and pattern[lcp] == previous[lcp]:
+            lcp += 1
+        del path[lcp + 1:]
+        current_node = path[-1]
+        for current_symbol in pattern[lcp:]:
+            current_node[current_symbol] = new_node_label
+            current_node = trie[new_node_label] = dict()
+            new_node_label += 1
+            path.append(current_node)
+        previous = pattern
+
+    return trie
+
+
 if __name__ == '__main__':
     patterns = sys.stdin.read().split()[1:]
     tree = build_trie(patterns)
@@ -0,0 +1,128 @@
+"""
+Multiple pattern matching with the Aho-Corasick automaton.
+
+"trie_matching.py" and "trie_matching_extended.py" call _prefix_trie_matching(text[i:], trie) for every
+starting position i in text. This copies the text once per position, and walks the trie from the root again
+each time, so it is O(|text| * |longest pattern|).
+
+Here we take the very same trie, the one returned by _build_trie() or _build_trie_sorted() from
+"trie_matching_extended.py" (dictionary of dictionaries, with the "end" label), and add two kinds of links to its nodes:
+    * failure link - fail[v] is the node that spells the longest proper suffix of the string spelled by v,
+      that is also present in the trie;
+    * output link - output[v] is the first node on the chain of failure links of v (v excluded) that ends
+      a pattern, or None if there is no such node.
+Links are computed in a BFS over the trie, because a node's failure link always points to a shallower node.
+
+Then we read the text only once, from left to right, and never go back. On a mismatch we follow failure links,
+and in every node we follow output links to report all patterns that end at the current position of the text.
+This is O(|text| + |patterns| + number of occurrences).
+
+A node may end more than one pattern if the same pattern is given more than once, so "ends" maps a node
+to a list of pattern IDs. Pattern ID is the index of the pattern in the input list.
+"""
+
+import sys
+from collections import deque
+
+from trie_matching_extended import _build_trie_sorted
+
+
+def _pattern_ends(trie, patterns):
+    """Return dictionary that maps each node that ends a pattern to the list of IDs of the patterns that it ends"""
+    ends = {}  # dict[int, list[int]]: {node: [pattern ID]}
+    for pattern_id, pattern in enumerate(patterns):
+        v = 0
+        for symbol in pattern:
+            v = trie[v][symbol]
+        ends.setdefault(v, []).append(pattern_id)
+    return ends
+
+
+def build_automaton(trie, patterns):
+    """Add failure and output links to trie, which was built from patterns by _build_trie_sorted(),
+       and return the automaton
+
+       The automaton is a tuple (trie, fail, output, ends, lengths).
+    """
+    ends = _pattern_ends(trie, patterns)
+    lengths = [len(pattern) for pattern in patterns]
+    fail = {0: 0}  # dict[int, int]: {node: node}
+    output = {0: None}  # dict[int, int]: {node: node}
+
+    q = deque()
+    for symbol, child in trie[0].items():
+        if symbol != "end":
+            fail[child] = 0
+            output[child] = None
+            q.append(child)
+    while q:
+        node = q.popleft()
+        for symbol, child in trie[node].items():
+            if symbol == "end":
+                continue
+            v = fail[node]
+            while v and symbol not in trie[v]:
+                v = fail[v]
+            v = trie[v].get(symbol, 0)
+            fail[child] = v
+            output[child] = v if v in ends else output[v]
+            q.append(child)
+
+    return trie, fail, output, ends, lengths
+
+
+def aho_corasick_scan(text, automaton, v=0, offset=0):
+    """Run automaton over text from node v, and yield (position, pattern ID) for every occurrence that ends in text
+
+       offset is the position of text[0] in a longer text, of which text is a part, and positions are in that text.
+       The whole state of the automaton is the node, so a longer text can be scanned part by part: the generator
+       returns the node in which it stops, which is where the scan of the next part starts.
+    """
+    trie, fail, output, ends, lengths = automaton
+    for i, symbol in enumerate(text, start=offset):
+        while v and symbol not in trie[v]:
+            v = fail[v]
+        v = trie[v].get(symbol, 0)
+        u = v if v in ends else output[v]
+        while u is not None:
+            for pattern_id in ends[u]:
+                yield i - lengths[pattern_id] + 1, pattern_id
+            u = output[u]
+    return v
+
+
+def aho_corasick_matching(text, automaton):
+    """Return iterator of (position, pattern ID) for every occurrence of every pattern in text,
+       found in one left-to-right pass
+
+       Position is the 0-based starting position of the occurrence in text.
+    """
+    return aho_corasick_scan(text, automaton)
+
+
+def trie_matching(text, automaton):
+    positions = set()
+    for position, _ in aho_corasick_matching(text, automaton):
+        positions.add(position)
+    return positions
+
+
+def solve(text, n, patterns):
+    tree = _build_trie_sorted(patterns)
+    automaton = build_automaton(tree, patterns)
+    result = list(trie_matching(text, automaton))
+    result.sort()
+
+    return result
+
+
+if __name__ == '__main__':
+    text = sys.stdin.readline().strip()
+    n = int(sys.stdin.readline().strip())
+    patterns = []
+    for i in range(n):
+        patterns.append(sys.stdin.readline().strip())
+
+    ans = solve(text, n, patterns)
+
+    sys.stdout.write(' '.join(map(str, ans)) + '\n')
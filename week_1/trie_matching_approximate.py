@@ -0,0 +1,72 @@
+"""
+Approximate multiple pattern matching: find all occurrences of the patterns with at most k mismatches.
+
+This is the Hamming distance, so an occurrence of a pattern is a substring of text of the same length as the
+pattern, that differs from it in at most k positions. Insertions and deletions are not taken into account.
+
+Like in "trie_matching_extended.py", we walk the trie built by _build_trie_sorted() from every position i in text,
+but not only along the edge that matches the next symbol of text. We go down all the edges, and count mismatches
+on the way. A branch is pruned as soon as the number of mismatches exceeds k. Once the budget of k mismatches is
+spent, there's no need to even look at other edges, so we only follow the edge that matches the text, if any.
+A walk doesn't stop at the first node that ends a pattern, because there may be more occurrences below it.
+Text is never copied; we compare its symbols at offsets i + depth.
+
+For k = 0 this is exact matching. Throughput falls off quickly as k grows, because the number of visited nodes
+grows roughly as (depth * alphabet size)^k. It's measured in "trie_matching_testing.py".
+"""
+
+import sys
+
+from trie_matching_extended import _build_trie_sorted
+from trie_matching_aho_corasick import _pattern_ends
+
+
+def approximate_matching(text, trie, ends, k):
+    """Yield (position, pattern ID, mismatches) for every occurrence of every pattern in text with at most k mismatches
+
+       trie is built by _build_trie_sorted(), and ends maps the nodes that end patterns to their IDs.
+    """
+    text_length = len(text)
+    for i in range(text_length):
+        stack = [(0, i, 0)]  # (node, position in text, mismatches)
+        while stack:
+            node, j, mismatches = stack.pop()
+            if node in ends:
+                for pattern_id in ends[node]:
+                    yield i, pattern_id, mismatches
+            if j == text_length:
+                continue
+            symbol = text[j]
+            children = trie[node]
+            if mismatches == k:
+                child = children.get(symbol)
+                if child:
+                    stack.append((child, j + 1, mismatches))
+                continue
+            for edge, child in children.items():
+                if edge == "end":
+                    continue
+                stack.append((child, j + 1, mismatches if edge == symbol else mismatches + 1))
+
+
+def solve(text, n, patterns, k):
+    tree = _build_trie_sorted(patterns)
+    ends = _pattern_ends(tree, patterns)
+    result = list({position for position, _, _ in approximate_matching(text, tree, ends, k)})
+    result.sort()
+
+    return result
+
+
+if __name__ == '__main__':
+    # Usage: python3 trie_matching_approximate.py k < input.txt
+    text = sys.stdin.readline().strip()
+    n = int(sys.stdin.readline().strip())
+    patterns = []
+    for i in range(n):
+        patterns.append(sys.stdin.readline().strip())
+    k = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+
+    ans = solve(text, n, patterns, k)
+
+    sys.stdout.write(' '.join(map(str, ans)) + '\n')
@@ -0,0 +1,181 @@
+"""
+Bit-parallel multiple pattern matching: Shift-Or (Shift-And) and Wu-Manber.
+
+A per-character walk through the trie, like in _prefix_trie_matching(), executes many Python bytecodes per
+character of text. The algorithms here do less work per character, in different ways.
+
+Shift-Or keeps a bit for every position of every pattern, all of them packed in one integer, state D.
+The patterns are laid one after another in it, so pattern k occupies bits [offsets[k], offsets[k] + len(pattern)).
+Bit j of a pattern is set in D if the first j + 1 symbols of the pattern match the text ending at the current
+position. For every symbol c there is a mask with bits set where the patterns contain c.
+So, one step for all the patterns at once is D = ((D << 1) | starts) & masks[c], where "starts" has the first bit of
+every pattern set, and a pattern occurs if its last bit is set in D. Shift-Or is the same algorithm with
+all the bits complemented. We use this form (which is also called Shift-And), because Python integers
+are not fixed-width, so complemented bits would need another AND per character to cut D to the right width.
+Up to 64 bits, that is, up to 64 symbols in all the patterns together, D fits in a machine word.
+Python integers are arbitrary-precision, so it still works for more symbols, but every step gets slower.
+
+Wu-Manber looks at the text through a window of m symbols, where m is the length of the shortest pattern,
+and reads only the last block of B symbols of the window. If that block doesn't end the first m symbols of any
+pattern, the window can be shifted right by several positions at once, as given by the SHIFT table.
+Otherwise, the HASH table gives the patterns whose first m symbols end with that block, and each of them is
+checked at the position directly. It skips most of the text if patterns are long, and there aren't too many
+of them. Block size is B = log_σ(2 * m * number of patterns), as suggested by Wu and Manber.
+
+solve() has the same API and gives the same result as in "trie_matching_extended.py", also for the empty pattern,
+which occurs at every position of text. Otherwise, it selects the fastest algorithm for the patterns,
+according to measurements on random texts over the alphabet ('$', 'A', 'C', 'G', 'T'):
+    * Wu-Manber, if it can shift the window by at least WU_MANBER_MIN_SHIFT positions for most blocks,
+      which is when the patterns are long enough, compared to their number; it's then several times faster
+      than the others, and the longer the patterns, the faster it is;
+    * Shift-Or, if all the patterns have at most SHIFT_OR_MAX_BITS symbols together, so that the state fits
+      in a machine word; it's then a bit faster than Aho-Corasick, and it gets slower than Aho-Corasick
+      as the state grows, already at a few hundred bits;
+    * Aho-Corasick, from "trie_matching_aho_corasick.py", otherwise.
+The measurements are repeated in "trie_matching_testing.py".
+"""
+
+import sys
+from math import ceil, log
+
+from trie_matching_extended import _build_trie_sorted
+from trie_matching_aho_corasick import build_automaton, aho_corasick_matching
+
+ALPHABET = ('$', 'A', 'C', 'G', 'T')
+
+SHIFT_OR_MAX_BITS = 64
+WU_MANBER_MIN_SHIFT = 3
+
+
+def preprocess_shift_or(patterns):
+    """Return (masks, starts, ends, end_bits) for patterns
+
+       masks - for every symbol c, the mask with bits set at positions of c in the patterns;
+       starts - the mask of the first bits of all the patterns;
+       ends - the mask of the last bits of all the patterns;
+       end_bits - for every last bit of a pattern, the list of (pattern ID, pattern length).
+    """
+    masks = {}  # dict[str, int]
+    starts = 0
+    ends = 0
+    end_bits = {}  # dict[int, list[tuple[int, int]]]
+    offset = 0
+    for pattern_id, pattern in enumerate(patterns):
+        if not pattern:
+            continue
+        for j, symbol in enumerate(pattern):
+            masks[symbol] = masks.get(symbol, 0) | (1 << (offset + j))
+        starts |= 1 << offset
+        offset += len(pattern)
+        ends |= 1 << (offset - 1)
+        end_bits.setdefault(offset - 1, []).append((pattern_id, len(pattern)))
+    return masks, starts, ends, end_bits
+
+
+def shift_or_matching(text, patterns):
+    """Yield (position, pattern ID) for every occurrence of every pattern in text, found with Shift-Or"""
+    masks, starts, ends, end_bits = preprocess_shift_or(patterns)
+    state = 0
+    for i, symbol in enumerate(text):
+        state = ((state << 1) | starts) & masks.get(symbol, 0)
+        hits = state & ends
+        while hits:
+            lowest = hits & -hits
+            for pattern_id, length in end_bits[lowest.bit_length() - 1]:
+                yield i - length + 1, pattern_id
+            hits ^= lowest
+
+
+def _block_size(patterns, m):
+    """Return Wu-Manber block size for patterns, whose shortest pattern has length m"""
+    block = ceil(log(2 * m * len(patterns), len(ALPHABET)))
+    return max(1, min(block, m))
+
+
+def preprocess_wu_manber(patterns):
+    """Return (m, block, shift, hashed) for patterns, which must all be non-empty
+
+       m - length of the shortest pattern;
+       block - block size B;
+       shift - for every block that occurs within the first m symbols of some pattern, how far the window may be
+           shifted if the block is the last one in the window (other blocks allow shift of m - B + 1);
+       hashed - for every block that ends the first m symbols of some pattern, the list of IDs of such patterns.
+    """
+    m = min(len(pattern) for pattern in patterns)
+    block = _block_size(patterns, m)
+    shift = {}  # dict[str, int]
+    hashed = {}  # dict[str, list[int]]
+    for pattern_id, pattern in enumerate(patterns):
+        for q in range(block, m + 1):
+            key = pattern[q - block: q]
+            shift[key] = min(shift.get(key, m), m - q)
+        hashed.setdefault(pattern[m - block: m], []).append(pattern_id)
+    return m, block, shift, hashed
+
+
+def wu_manber_matching(text, patterns):
+    """Yield (position, pattern ID) for every occurrence of every pattern in text, found with Wu-Manber"""
+    m, block, shift, hashed = preprocess_wu_manber(patterns)
+    default_shift = m - block + 1
+    text_length = len(text)
+    i = m - 1  # End of the window.
+    while i < text_length:
+        key = text[i - block + 1: i + 1]
+        step = shift.get(key, default_shift)
+        if step:
+            i += step
+            continue
+        start = i - m + 1
+        for pattern_id in hashed[key]:
+            if text.startswith(patterns[pattern_id], start):
+                yield start, pattern_id
+        i += 1
+
+
+def select_algorithm(patterns):
+    """Return name of the fastest algorithm for patterns, which must all be non-empty:
+       "wu-manber", "shift-or" or "aho-corasick"
+    """
+    m = min(len(pattern) for pattern in patterns)
+    block = _block_size(patterns, m)
+    if m - block + 1 >= WU_MANBER_MIN_SHIFT:
+        return "wu-manber"
+    if sum(len(pattern) for pattern in patterns) <= SHIFT_OR_MAX_BITS:
+        return "shift-or"
+    return "aho-corasick"
+
+
+def trie_matching(text, patterns):
+    if "" in patterns:
+        # The empty pattern occurs at every position of text, like in "trie_matching_extended.py",
+        # so the other patterns can't add anything.
+        return set(range(len(text)))
+    algorithm = select_algorithm(patterns)
+    if algorithm == "shift-or":
+        occurrences = shift_or_matching(text, patterns)
+    elif algorithm == "wu-manber":
+        occurrences = wu_manber_matching(text, patterns)
+    else:
+        occurrences = aho_corasick_matching(text, build_automaton(_build_trie_sorted(patterns), patterns))
+    return {position for position, _ in occurrences}
+
+
+def solve(text, n, patterns):
+    if not patterns:
+        return []
+    result = list(trie_matching(text, patterns))
+    result.sort()
+
+    return result
+
+
+if __name__ == '__main__':
+    text = sys.stdin.readline().strip()
+    n = int(sys.stdin.readline().strip())
+    patterns = []
+    for i in range(n):
+        patterns.append(sys.stdin.readline().strip())
+
+    ans = solve(text, n, patterns)
+
+    sys.stdout.write(' '.join(map(str, ans)) + '\n')
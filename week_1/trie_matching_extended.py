@@ -30,6 +30,31 @@ def _build_trie(patterns):
     return trie
 
 
+def _build_trie_sorted(patterns):
+    """Build and return the same trie as _build_trie(), in one pass over the sorted patterns,
+       like build_trie_sorted() in "trie.py"
+    """
+    trie = {0: {"end": False}}
+    path = [trie[0]]  # Nodes on the path of the previous pattern; path[d] is at depth d.
+    previous = ""
+    new_node_label = 1
+    for pattern in sorted(patterns):
+        lcp = 0
+        limit = min(len(pattern), len(previous))
+        while lcp < limit and pattern[lcp] == previous[lcp]:
+            lcp += 1
+        del path[lcp + 1:]
+        current_node = path[-1]
+        for current_symbol in pattern[lcp:]:
+            current_node[current_symbol] = new_node_label
+            current_node = trie[new_node_label] = {"end": False}
+            new_node_label += 1
+            path.append(current_node)
+        current_node["end"] = True
+        previous = pattern
+    return trie
+
+
 def _prefix_trie_matching(text, trie):
     v = trie[0]
     i = 0
@@ -58,7 +83,7 @@ def trie_matching(text, trie):
 
 
 def solve(text, n, patterns):
-    tree = _build_trie(patterns)
+    tree = _build_trie_sorted(patterns)
     result = trie_matching(text, tree)
     result = list(set(result))
     result.sort()
@@ -66,12 +91,13 @@ def solve(text, n, patterns):
     return result
 
 
-text = sys.stdin.readline().strip()
-n = int(sys.stdin.readline().strip())
-patterns = []
-for i in range(n):
-    patterns.append(sys.stdin.readline().strip())
+if __name__ == '__main__':
+    text = sys.stdin.readline().strip()
+    n = int(sys.stdin.readline().strip())
+    patterns = []
+    for i in range(n):
+        patterns.append(sys.stdin.readline().strip())
 
-ans = solve(text, n, patterns)
+    ans = solve(text, n, patterns)
 
-sys.stdout.write(' '.join(map(str, ans)) + '\n')
+    sys.stdout.write(' '.join(map(str, ans)) + '\n')
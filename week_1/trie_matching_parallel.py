@@ -0,0 +1,114 @@
+"""
+Multiple pattern matching on many processes.
+
+The text is split into shards, and each shard is searched in its own worker process, with the Aho-Corasick
+automaton from "trie_matching_aho_corasick.py". The trie and the automaton are built only once, in the main process,
+and are handed to every worker once, when the worker starts, and not once per shard.
+
+A shard owns the positions [start, end) of the text, but it's searched in text[start: end + longest - 1],
+where "longest" is the length of the longest pattern. So, the neighbouring shards overlap by longest - 1 characters,
+and an occurrence that starts in the owned part of a shard is always found completely inside of that shard,
+even when it crosses into the next one. An occurrence that starts in the overlap region is found in both shards.
+These duplicates are dropped while merging the results, by keeping only those positions that a shard owns.
+A worker sends back only distinct positions, because many patterns can start at the same position.
+
+There are SHARDS_PER_WORKER shards per worker, so that a slow shard doesn't keep the other workers idle.
+benchmark() measures speedup against the single-process "trie_matching_aho_corasick.py" for different numbers
+of workers. It's run from "trie_matching_testing.py".
+"""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from timeit import default_timer as timer
+
+from trie_matching_extended import _build_trie_sorted
+from trie_matching_aho_corasick import build_automaton, aho_corasick_matching
+
+SHARDS_PER_WORKER = 4
+
+_automaton = None  # Set in each worker process by _init_worker().
+
+
+def _init_worker(automaton):
+    global _automaton
+    _automaton = automaton
+
+
+def _match_shard(shard):
+    start, text = shard
+    return sorted({start + position for position, _ in aho_corasick_matching(text, _automaton)})
+
+
+def _split(text, longest, num_shards):
+    """Return list of (start, end, shard text), where [start, end) is the part of text that a shard owns"""
+    length = len(text)
+    shard_size = max(1, -(-length // num_shards))
+    shards = []
+    for start in range(0, length, shard_size):
+        end = min(start + shard_size, length)
+        shards.append((start, end, text[start: end + longest - 1]))
+    return shards
+
+
+def parallel_trie_matching(text, automaton, workers=None):
+    """Return set of starting positions of all occurrences of all patterns in text, found on workers processes"""
+    if workers is None:
+        workers = os.cpu_count()
+    longest = max(automaton[4], default=0)
+    shards = _split(text, longest, workers * SHARDS_PER_WORKER)
+    positions = set()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(automaton,)) as executor:
+        results = executor.map(_match_shard, [(start, shard_text) for start, _, shard_text in shards])
+        for (start, end, _), found in zip(shards, results):
+            for position in found:
+                if position < end:
+                    positions.add(position)
+    return positions
+
+
+def solve(text, n, patterns, workers=None):
+    tree = _build_trie_sorted(patterns)
+    automaton = build_automaton(tree, patterns)
+    result = list(parallel_trie_matching(text, automaton, workers))
+    result.sort()
+
+    return result
+
+
+def benchmark(text, patterns, max_workers=None):
+    """Print time and speedup of parallel matching for 1, 2, 4, ... workers, against a single process"""
+    if max_workers is None:
+        max_workers = os.cpu_count()
+    automaton = build_automaton(_build_trie_sorted(patterns), patterns)
+
+    start = timer()
+    expected = {position for position, _ in aho_corasick_matching(text, automaton)}
+    end = timer()
+    single_time = end - start
+    print(f"Single process: {single_time:.3f} s")
+
+    workers = 1
+    while True:
+        start = timer()
+        result = parallel_trie_matching(text, automaton, workers)
+        end = timer()
+        parallel_time = end - start
+        assert result == expected
+        print(f"{workers:3} workers: {parallel_time:.3f} s, speedup = {single_time / parallel_time:.2f}x, "
+              f"efficiency = {single_time / parallel_time / workers:.0%}")
+        if workers >= max_workers:
+            break
+        workers = min(2 * workers, max_workers)
+
+
+if __name__ == '__main__':
+    text = sys.stdin.readline().strip()
+    n = int(sys.stdin.readline().strip())
+    patterns = []
+    for i in range(n):
+        patterns.append(sys.stdin.readline().strip())
+
+    ans = solve(text, n, patterns)
+
+    sys.stdout.write(' '.join(map(str, ans)) + '\n')
@@ -0,0 +1,66 @@
+"""
+Streaming multiple pattern matching, for texts that don't fit in memory.
+
+"trie_matching_extended.py" reads the whole text with sys.stdin.readline() before it starts matching.
+Here the text comes as an iterator of chunks, or as a file object that is read in chunks of CHUNK_SIZE characters.
+
+The Aho-Corasick automaton from "trie_matching_aho_corasick.py" never goes back in the text, so its whole state
+is just the current node. aho_corasick_scan() returns that node at the end of a chunk, and we carry it over
+to the next chunk, together with the number of characters seen so far, which turns positions within a chunk
+into absolute positions in the text.
+So, an occurrence that spans a chunk boundary is found like any other, and memory is bounded by the size of
+one chunk plus the size of the automaton. Matches are yielded as soon as they are found, ordered by their end.
+
+Newline characters are not a part of the text. They are dropped when reading from a file, so that a sequence
+that is split over many lines is matched as a single text, and positions are counted in that text.
+"""
+
+import sys
+
+from trie_matching_extended import _build_trie_sorted
+from trie_matching_aho_corasick import aho_corasick_scan, build_automaton
+
+CHUNK_SIZE = 1 << 16
+
+
+def read_chunks(file, chunk_size=CHUNK_SIZE):
+    """Yield chunks of text read from file, without newline characters"""
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk.replace("\n", "").replace("\r", "")
+
+
+def stream_matching(chunks, automaton):
+    """Yield (position, pattern ID) for every occurrence of every pattern in text that is given in chunks
+
+       chunks is an iterable of strings, or a file object.
+       Position is the 0-based starting position of the occurrence in the whole text.
+    """
+    if hasattr(chunks, "read"):
+        chunks = read_chunks(chunks)
+    v = 0
+    offset = 0
+    for chunk in chunks:
+        v = yield from aho_corasick_scan(chunk, automaton, v, offset)
+        offset += len(chunk)
+
+
+def read_patterns(file):
+    n = int(file.readline().strip())
+    patterns = []
+    for i in range(n):
+        patterns.append(file.readline().strip())
+    return patterns
+
+
+if __name__ == '__main__':
+    # Usage: python3 trie_matching_streaming.py patterns.txt < text.txt
+    # "patterns.txt" contains the number of patterns in the first line, and then one pattern per line.
+    # Prints "position pattern_ID" for every occurrence, as soon as it's found.
+    with open(sys.argv[1]) as patterns_file:
+        patterns = read_patterns(patterns_file)
+    automaton = build_automaton(_build_trie_sorted(patterns), patterns)
+    for position, pattern_id in stream_matching(sys.stdin, automaton):
+        sys.stdout.write("{} {}\n".format(position, pattern_id))
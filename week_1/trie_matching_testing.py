@@ -0,0 +1,200 @@
+""" Test and compare various implementations of the trie and of multiple pattern matching to one another """
+import tracemalloc
+from datetime import timedelta
+from random import choices, randint
+from timeit import default_timer as timer
+
+import trie
+import trie_array
+import trie_matching_aho_corasick
+import trie_matching_approximate
+import trie_matching_bit_parallel
+import trie_matching_extended
+import trie_matching_parallel
+import trie_radix
+
+
+"""
+Memory is measured with "tracemalloc", as the total size of all blocks that are allocated while building the trie.
+Lookups per second is the number of transitions made per second while walking all the patterns from the root.
+The ArrayTrie is measured twice: through its node views (the adapter that "trie_matching.py" uses),
+and through ArrayTrie.child(), which is how fast code should use it.
+
+The compressed (radix) trie is compared to the uncompressed trie by number of nodes and by matching throughput,
+in characters of text per second.
+
+Bit-parallel algorithms are compared to Aho-Corasick for pattern sets of different sizes and lengths.
+The algorithm that trie_matching_bit_parallel.solve() selects for a set is marked with "*".
+
+Approximate matching is measured for k = 0, 1, ..., MAX_MISMATCHES, in characters of text per second.
+
+Parallel matching is benchmarked on a longer text, with fewer and longer patterns, such as adapters and primers,
+and with as many workers as there are CPUs, at most.
+"""
+
+
+ALPHABET = ('A', 'C', 'G', 'T')
+NUM_PATTERNS = 10**4
+MAX_PATTERN_LENGTH = 30
+TEXT_LENGTH = 10**4
+LONG_PATTERN_MIN_LENGTH = 12
+PARALLEL_NUM_PATTERNS = 10**3
+APPROXIMATE_NUM_PATTERNS = 10**2
+APPROXIMATE_TEXT_LENGTH = 2 * 10**3
+MAX_MISMATCHES = 3
+BIT_PARALLEL_TEXT_LENGTH = 2 * 10**5
+BIT_PARALLEL_PATTERN_SETS = (  # (number of patterns, minimum length, maximum length)
+    (2, 4, 8), (8, 3, 6), (8, 8, 16), (32, 8, 16), (100, 4, 8), (1000, 4, 8), (1000, 12, 30),
+)
+PARALLEL_TEXT_LENGTH = 10**6
+
+
+def generate_text(length):
+    return "".join(choices(population=ALPHABET, k=length))
+
+
+def generate_patterns(count, max_length, min_length=1):
+    return [generate_text(randint(min_length, max_length)) for _ in range(count)]
+
+
+def measure_build(build, patterns):
+    tracemalloc.start()
+    start = timer()
+    tree = build(patterns)
+    end = timer()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return tree, end - start, memory
+
+
+def lookups_per_second(walk, tree, patterns):
+    lookups = sum(len(pattern) for pattern in patterns)
+    start = timer()
+    for pattern in patterns:
+        walk(tree, pattern)
+    end = timer()
+    return lookups / (end - start)
+
+
+def _walk_dict(tree, pattern):
+    v = 0
+    for symbol in pattern:
+        v = tree[v][symbol]
+
+
+def _walk_view(tree, pattern):
+    v = tree[0]
+    for symbol in pattern:
+        v = tree[v[symbol]]
+
+
+def _walk_array(tree, pattern):
+    v = 0
+    child = tree.child
+    for symbol in pattern:
+        v = child(v, symbol)
+
+
+def compare_tries(patterns, text):
+    dict_trie, dict_time, dict_memory = measure_build(trie.build_trie, patterns)
+    array_trie, array_time, array_memory = measure_build(trie_array.build_trie, patterns)
+    nodes = len(dict_trie)
+    assert nodes == len(array_trie)
+
+    print(f"Number of nodes: {nodes}")
+    print(f"Dict  trie: built in {dict_time:.3f} s [{timedelta(seconds=dict_time)}], "
+          f"{dict_memory / nodes:.1f} bytes per node")
+    print(f"Array trie: built in {array_time:.3f} s [{timedelta(seconds=array_time)}], "
+          f"{array_memory / nodes:.1f} bytes per node")
+    dict_sorted_trie, dict_sorted_time, dict_sorted_memory = measure_build(trie.build_trie_sorted, patterns)
+    assert len(dict_sorted_trie) == nodes
+    print(f"Dict  trie: built from sorted patterns in {dict_sorted_time:.3f} s "
+          f"[{timedelta(seconds=dict_sorted_time)}], {dict_sorted_memory / nodes:.1f} bytes per node")
+    sorted_trie, sorted_time, sorted_memory = measure_build(trie_array.build_trie_sorted, patterns)
+    assert len(sorted_trie) == nodes
+    print(f"Array trie: built from sorted patterns in {sorted_time:.3f} s [{timedelta(seconds=sorted_time)}], "
+          f"{sorted_memory / nodes:.1f} bytes per node")
+
+    print(f"Dict  trie: {lookups_per_second(_walk_dict, dict_trie, patterns):,.0f} lookups/s")
+    print(f"Array trie: {lookups_per_second(_walk_view, array_trie, patterns):,.0f} lookups/s (node views)")
+    print(f"Array trie: {lookups_per_second(_walk_array, array_trie, patterns):,.0f} lookups/s (child())")
+
+    extended_trie = trie_matching_extended._build_trie(patterns)
+    expected = trie_matching_extended.trie_matching(text, extended_trie)
+    assert trie_matching_extended.trie_matching(text, array_trie) == expected
+    assert trie_matching_extended.trie_matching(text, sorted_trie) == expected
+    assert trie_matching_extended.trie_matching(text, trie_matching_extended._build_trie_sorted(patterns)) == expected
+
+
+def compare_radix(patterns, text):
+    dict_trie = trie_matching_extended._build_trie(patterns)
+    radix_trie = trie_radix.build_trie(patterns)
+    print(f"Uncompressed trie: {len(dict_trie)} nodes")
+    print(f"Compressed trie:   {trie_radix.count_nodes(radix_trie)} nodes")
+
+    start = timer()
+    expected = trie_matching_extended.trie_matching(text, dict_trie)
+    end = timer()
+    dict_time = end - start
+    print(f"Uncompressed trie: {len(text) / dict_time:,.0f} characters/s")
+
+    start = timer()
+    result = trie_radix.trie_matching(text, radix_trie, patterns)
+    end = timer()
+    radix_time = end - start
+    print(f"Compressed trie:   {len(text) / radix_time:,.0f} characters/s")
+
+    assert result == expected
+
+
+def compare_bit_parallel(text):
+    for count, min_length, max_length in BIT_PARALLEL_PATTERN_SETS:
+        patterns = generate_patterns(count, max_length, min_length)
+        automaton = trie_matching_aho_corasick.build_automaton(trie_matching_extended._build_trie(patterns), patterns)
+        algorithms = {
+            "aho-corasick": lambda: trie_matching_aho_corasick.aho_corasick_matching(text, automaton),
+            "shift-or": lambda: trie_matching_bit_parallel.shift_or_matching(text, patterns),
+            "wu-manber": lambda: trie_matching_bit_parallel.wu_manber_matching(text, patterns),
+        }
+        selected = trie_matching_bit_parallel.select_algorithm(patterns)
+        report = []
+        expected = None
+        for name, algorithm in algorithms.items():
+            start = timer()
+            result = sorted(algorithm())
+            end = timer()
+            if expected is None:
+                expected = result
+            assert result == expected
+            report.append(f"{name}{'*' if name == selected else ''} {end - start:.3f} s")
+        print(f"{count:5} patterns of length {min_length:2}-{max_length:2}: " + ", ".join(report))
+
+
+def compare_approximate(patterns, text):
+    tree = trie_matching_extended._build_trie(patterns)
+    ends = trie_matching_aho_corasick._pattern_ends(tree, patterns)
+    for k in range(MAX_MISMATCHES + 1):
+        start = timer()
+        occurrences = list(trie_matching_approximate.approximate_matching(text, tree, ends, k))
+        end = timer()
+        print(f"k = {k}: {len(text) / (end - start):,.0f} characters/s, {len(occurrences)} occurrences")
+        if k == 0:
+            expected = sorted(trie_matching_aho_corasick.aho_corasick_matching(
+                text, trie_matching_aho_corasick.build_automaton(tree, patterns)))
+            assert sorted((position, pattern_id) for position, pattern_id, _ in occurrences) == expected
+
+
+if __name__ == '__main__':
+    patterns = generate_patterns(NUM_PATTERNS, MAX_PATTERN_LENGTH)
+    text = generate_text(TEXT_LENGTH)
+    compare_tries(patterns, text)
+    print()
+    compare_radix(generate_patterns(NUM_PATTERNS, MAX_PATTERN_LENGTH, LONG_PATTERN_MIN_LENGTH), text)
+    print()
+    compare_bit_parallel(generate_text(BIT_PARALLEL_TEXT_LENGTH))
+    print()
+    compare_approximate(generate_patterns(APPROXIMATE_NUM_PATTERNS, MAX_PATTERN_LENGTH, LONG_PATTERN_MIN_LENGTH),
+                        generate_text(APPROXIMATE_TEXT_LENGTH))
+    print()
+    patterns = generate_patterns(PARALLEL_NUM_PATTERNS, MAX_PATTERN_LENGTH, LONG_PATTERN_MIN_LENGTH)
+    trie_matching_parallel.benchmark(generate_text(PARALLEL_TEXT_LENGTH), patterns)
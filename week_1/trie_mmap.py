@@ -0,0 +1,104 @@
+"""
+Binary on-disk format for the array-backed trie from "trie_array.py", which is loaded with mmap.
+
+A large set of patterns changes rarely, but every process would otherwise build its trie from scratch.
+Instead, we build the trie once, save it to a file, and every process maps that file into memory.
+The columns of the loaded ArrayTrie are memoryviews of the mapped file, so loading doesn't create
+any per-node Python objects and doesn't even read the file. Pages are read from disk on first access,
+and all the processes that map the same file share one copy of it in the page cache.
+
+The file is made of a header and four sections, each of them a flat array:
+    header      - magic b"TRIE", format version, byte order, width of the alphabet and number of nodes;
+    alphabet    - the symbols, in rank order, each as a UTF-32 code point;
+    transitions - number of nodes * width 32-bit integers, the transition table;
+    pattern IDs - number of nodes 32-bit integers;
+    end flags   - number of nodes bytes.
+The 32-bit sections come first, so that all of them are aligned to 4 bytes.
+Integers are stored in the native byte order, so that they can be used without conversion.
+A file that was written on a machine with a different byte order is rejected.
+
+For a large set of patterns, the trie is best built with build_trie_sorted() from "trie_array.py".
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+from timeit import default_timer as timer
+
+from trie_array import ArrayTrie, build_trie_sorted
+
+MAGIC = b"TRIE"
+VERSION = 1
+HEADER = struct.Struct("<4sIcxxxII")  # magic, version, byte order, (padding), width, number of nodes
+
+
+class MappedTrie(ArrayTrie):
+    """ArrayTrie whose columns are views of a memory-mapped file"""
+
+    def __init__(self, alphabet, transitions, end, pattern_ids, mapping):
+        super().__init__(alphabet, transitions, end, pattern_ids)
+        self.mapping = mapping
+
+    def add_node(self):
+        raise TypeError("memory-mapped trie is read-only")
+
+    def close(self):
+        self.transitions.release()
+        self.end.release()
+        self.pattern_ids.release()
+        self.mapping.close()
+
+
+def save_trie(trie, path):
+    """Save ArrayTrie trie to a file at path"""
+    byte_order = b"L" if sys.byteorder == "little" else b"B"
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, byte_order, trie.width, len(trie)))
+        file.write(array('I', map(ord, trie.alphabet)).tobytes())
+        file.write(memoryview(trie.transitions).cast('B'))
+        file.write(memoryview(trie.pattern_ids).cast('B'))
+        file.write(trie.end)
+
+
+def load_trie(path):
+    """Map the file at path, that was written by save_trie(), into memory and return it as a MappedTrie"""
+    with open(path, "rb") as file:
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, byte_order, width, nodes = HEADER.unpack_from(mapping)
+    if magic != MAGIC or version != VERSION:
+        mapping.close()
+        raise ValueError(f"{path} is not a trie file of version {VERSION}")
+    if byte_order != (b"L" if sys.byteorder == "little" else b"B"):
+        mapping.close()
+        raise ValueError(f"{path} was written with a different byte order")
+
+    view = memoryview(mapping)
+    offset = HEADER.size
+    alphabet = [chr(code) for code in view[offset: offset + 4 * width].cast('I')]
+    offset += 4 * width
+    transitions = view[offset: offset + 4 * width * nodes].cast('i')
+    offset += 4 * width * nodes
+    pattern_ids = view[offset: offset + 4 * nodes].cast('i')
+    offset += 4 * nodes
+    end = view[offset: offset + nodes]
+    view.release()
+    return MappedTrie(alphabet, transitions, end, pattern_ids, mapping)
+
+
+if __name__ == '__main__':
+    # Usage: python3 trie_mmap.py trie.bin < patterns.txt
+    # Input is the same as in "trie.py". Builds the trie, saves it to "trie.bin", and then loads it back.
+    patterns = sys.stdin.read().split()[1:]
+
+    start = timer()
+    tree = build_trie_sorted(patterns)
+    end = timer()
+    print(f"Building the trie of {len(tree)} nodes took {end - start:.6f} s")
+    save_trie(tree, sys.argv[1])
+
+    start = timer()
+    tree = load_trie(sys.argv[1])
+    end = timer()
+    print(f"Loading the trie of {len(tree)} nodes took {end - start:.6f} s")
+    tree.close()
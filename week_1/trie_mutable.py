@@ -0,0 +1,225 @@
+"""
+Mutable trie of patterns, with Aho-Corasick matching, that supports adding and removing patterns without rebuilds.
+
+The trie is a dictionary of dictionaries, like in "trie.py", e.g. {0:{'A':1,'T':2},1:{'C':3}}.
+Additionally, for every node we keep its parent, the symbol on its incoming edge, and the number of patterns
+whose path goes through it. A pattern may be added more than once, so its end marker is a reference count, too.
+When removing a pattern, these counts are decremented along its path, and the nodes whose count drops to zero
+are pruned. Those always form the bottom part of the path, so pruning is O(|pattern|).
+
+Failure and output links are the same as in "trie_matching_aho_corasick.py", but they are computed lazily,
+only for nodes that a search actually enters, and then they are cached.
+For failure links we also keep the reverse index, "fail_in", which gives the nodes whose cached failure link
+points to a given node. After a change, we drop only those cached failure links that became wrong:
+    * Adding a pattern adds new nodes. An existing node's failure link changes only if it should now point to
+      a new node w. Then it used to point to g(w), the longest proper suffix of w's string that was in the trie
+      before the change. So, it's enough to drop the cached links in fail_in[g(w)], for every new node w.
+      g(w) is computed before the new nodes are inserted, with the links that are valid at that time.
+    * Removing a pattern prunes some nodes. An existing node's failure link changes only if it pointed to
+      a pruned node, so we drop the cached links in fail_in of every pruned node.
+Output links depend on whole chains of failure links, and on end markers, so a change can affect them far away
+from the changed nodes. They are cached together with the "generation" of the trie at the time of computing,
+and the generation is incremented on every change, which invalidates all of them at once, in O(1).
+They are recomputed lazily, too.
+
+Changes and searches must not be interleaved, i.e., a change must not be made while a search is in progress.
+"""
+
+import sys
+
+
+class MutableTrie:
+    """Trie of patterns, that supports add(pattern), remove(pattern) and search(text)"""
+
+    def __init__(self, patterns=()):
+        self.trie = {0: {}}  # dict[int, dict[str, int]]: {node: {symbol: node}}
+        self.parent = {0: None}  # dict[int, int]
+        self.symbol = {0: None}  # dict[int, str]
+        self.count = {0: 0}  # dict[int, int]: number of patterns whose path goes through the node
+        self.ends = {}  # dict[int, int]: number of times the node's pattern was added, for nodes that end a pattern
+        self.patterns = {}  # dict[int, str]: the node's pattern, for nodes that end a pattern
+        self.new_node_label = 1
+
+        self.fail = {0: 0}  # dict[int, int]: cached failure links
+        self.fail_in = {}  # dict[int, set[int]]: reverse index of cached failure links
+        self.output = {}  # dict[int, tuple[int, int]]: {node: (generation, node or None)}, cached output links
+        self.generation = 0
+
+        for pattern in patterns:
+            self.add(pattern)
+
+    def _fail_link(self, node):
+        """Return failure link of node, computing it and the missing failure links of its ancestors, if needed"""
+        path = []
+        v = node
+        while v not in self.fail:
+            path.append(v)
+            v = self.parent[v]
+        for v in reversed(path):
+            parent = self.parent[v]
+            symbol = self.symbol[v]
+            f = 0
+            if parent:
+                f = self.fail[parent]
+                while f and symbol not in self.trie[f]:
+                    f = self._fail_link(f)
+                f = self.trie[f].get(symbol, 0)
+            self.fail[v] = f
+            self.fail_in.setdefault(f, set()).add(v)
+        return self.fail[node]
+
+    def _output_link(self, node):
+        """Return the first node on the chain of failure links of node (node excluded) that ends a pattern, or None"""
+        path = []
+        v = node
+        while True:
+            cached = self.output.get(v)
+            if cached is not None and cached[0] == self.generation:
+                target = cached[1]
+                break
+            path.append(v)
+            if v == 0:
+                target = None
+                break
+            v = self._fail_link(v)
+            if v in self.ends:
+                target = v
+                break
+        for v in reversed(path):
+            self.output[v] = (self.generation, target)
+            if v in self.ends:
+                target = v
+        return self.output[node][1]
+
+    def _drop_fail_links(self, nodes):
+        for v in nodes:
+            del self.fail[v]
+
+    def add(self, pattern):
+        """Add pattern to the trie"""
+        trie = self.trie
+
+        # Walk the existing part of the path, and compute g(w) for the new nodes, before inserting them.
+        v = 0
+        depth = 0
+        while depth < len(pattern) and pattern[depth] in trie[v]:
+            v = trie[v][pattern[depth]]
+            depth += 1
+        suffixes = set()  # g(w) for all new nodes w
+        f = self._fail_link(v)
+        for j in range(depth, len(pattern)):
+            symbol = pattern[j]
+            if j == 0:
+                g = 0
+            else:
+                while f and symbol not in trie[f]:
+                    f = self._fail_link(f)
+                g = trie[f].get(symbol, 0)
+                f = g
+            suffixes.add(g)
+        stale = set()
+        for g in suffixes:
+            stale.update(self.fail_in.pop(g, ()))
+        self._drop_fail_links(stale)
+
+        v = 0
+        self.count[0] += 1
+        for symbol in pattern:
+            child = trie[v].get(symbol)
+            if child is None:
+                child = self.new_node_label
+                self.new_node_label += 1
+                trie[v][symbol] = child
+                trie[child] = {}
+                self.parent[child] = v
+                self.symbol[child] = symbol
+                self.count[child] = 0
+            self.count[child] += 1
+            v = child
+        self.ends[v] = self.ends.get(v, 0) + 1
+        self.patterns[v] = pattern
+        self.generation += 1
+
+    def remove(self, pattern):
+        """Remove one copy of pattern from the trie, and prune the nodes that aren't on any pattern's path anymore
+
+           Raise KeyError if pattern is not in the trie.
+        """
+        trie = self.trie
+        path = [0]
+        for symbol in pattern:
+            child = trie[path[-1]].get(symbol)
+            if child is None:
+                raise KeyError(pattern)
+            path.append(child)
+        v = path[-1]
+        if v not in self.ends:
+            raise KeyError(pattern)
+
+        self.ends[v] -= 1
+        if not self.ends[v]:
+            del self.ends[v]
+            del self.patterns[v]
+        for u in path:
+            self.count[u] -= 1
+
+        pruned = [u for u in path if u and not self.count[u]]
+        if pruned:
+            top = pruned[0]
+            del trie[self.parent[top]][self.symbol[top]]
+            stale = set()
+            for u in pruned:
+                stale.update(self.fail_in.pop(u, ()))
+                if u in self.fail:
+                    self.fail_in.get(self.fail[u], set()).discard(u)
+                    del self.fail[u]
+                self.output.pop(u, None)
+                del trie[u], self.parent[u], self.symbol[u], self.count[u]
+            stale.difference_update(pruned)
+            self._drop_fail_links(stale)
+        self.generation += 1
+
+    def search(self, text):
+        """Yield (position, pattern) for every occurrence of every pattern in text, in one left-to-right pass
+
+           Position is the 0-based starting position of the occurrence in text.
+        """
+        trie = self.trie
+        v = 0
+        for i, symbol in enumerate(text):
+            while v and symbol not in trie[v]:
+                v = self._fail_link(v)
+            v = trie[v].get(symbol, 0)
+            u = v if v in self.ends else self._output_link(v)
+            while u is not None:
+                pattern = self.patterns[u]
+                yield i - len(pattern) + 1, pattern
+                u = self._output_link(u)
+
+    def __contains__(self, pattern):
+        v = 0
+        for symbol in pattern:
+            v = self.trie[v].get(symbol)
+            if v is None:
+                return False
+        return v in self.ends
+
+
+def solve(text, n, patterns):
+    tree = MutableTrie(patterns)
+    result = list({position for position, _ in tree.search(text)})
+    result.sort()
+
+    return result
+
+
+if __name__ == '__main__':
+    text = sys.stdin.readline().strip()
+    n = int(sys.stdin.readline().strip())
+    patterns = []
+    for i in range(n):
+        patterns.append(sys.stdin.readline().strip())
+
+    ans = solve(text, n, patterns)
+
+    sys.stdout.write(' '.join(map(str, ans)) + '\n')
@@ -0,0 +1,126 @@
+"""
+Compressed trie (radix trie, Patricia trie) of patterns.
+
+The trie from "trie.py" has one node per character, so a long pattern that shares little with the others
+becomes a long chain of nodes with a single child each. Every such node costs memory, and a hop per character.
+
+Here every chain of nodes with a single child, that don't end a pattern, is compressed into one edge,
+just like in the suffix tree. Edge labels aren't stored as substrings. Like in "suffix_tree_v2.py",
+we store the starting and ending positions of the label, only in a pattern instead of in the text.
+So, the incoming edge of a Node is patterns[node.pattern][node.start: node.end].
+Additionally, we store the ID of the pattern that ends in a node, in case of nodes that end a pattern only.
+Pattern ID is the index of the pattern in the list of patterns.
+
+Number of nodes is at most 2 * (number of patterns) + 1, no matter how long the patterns are.
+Node counts and matching throughput of the compressed and the uncompressed trie are compared
+in "trie_matching_testing.py".
+"""
+
+import sys
+
+
+class Node:
+    """
+    A Node contains the index of the pattern that holds its edge label, starting and ending positions of the label
+    in that pattern, and the ID of the pattern that ends in the node, in case of nodes that end a pattern only.
+    """
+
+    def __init__(self, pattern=None, start=None, end=None, pattern_id=None):
+        self.children = {}  # dict[char, Node]
+        self.pattern = pattern
+        self.start = start
+        self.end = end
+        self.pattern_id = pattern_id
+
+
+def build_trie(patterns):
+    """Build compressed trie from patterns and return its root"""
+    root = Node()
+    for pattern_id, pattern in enumerate(patterns):
+        pattern_length = len(pattern)
+        current = root
+        j = 0
+        while j < pattern_length:
+            try:
+                next_node = current.children[pattern[j]]
+            except KeyError:
+                current.children[pattern[j]] = Node(pattern=pattern_id, start=j, end=pattern_length,
+                                                    pattern_id=pattern_id)
+                break
+            else:
+                label = patterns[next_node.pattern]
+                nn_start = next_node.start
+                overlap = 1
+                while nn_start + overlap < next_node.end and j + overlap < pattern_length \
+                        and pattern[j + overlap] == label[nn_start + overlap]:
+                    overlap += 1
+                if nn_start + overlap < next_node.end:
+                    new_internal = Node(pattern=next_node.pattern, start=nn_start, end=nn_start + overlap)
+                    next_node.start += overlap
+                    new_internal.children[label[next_node.start]] = next_node
+                    current.children[pattern[j]] = new_internal
+                    next_node = new_internal
+                current = next_node
+                j += overlap
+        else:
+            if current.pattern_id is None:
+                current.pattern_id = pattern_id
+    return root
+
+
+def count_nodes(trie):
+    """Return number of nodes in trie, root included"""
+    count = 0
+    stack = [trie]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(node.children.values())
+    return count
+
+
+def prefix_trie_matching(text, i, trie, patterns):
+    """Return ID of the shortest pattern that is a prefix of text[i:], or None
+
+       Text is not copied. A whole edge label is compared to text at once.
+    """
+    text_length = len(text)
+    node = trie
+    while True:
+        if node.pattern_id is not None:
+            return node.pattern_id
+        if i == text_length:
+            return None
+        node = node.children.get(text[i])
+        if node is None:
+            return None
+        if not text.startswith(patterns[node.pattern][node.start: node.end], i):
+            return None
+        i += node.end - node.start
+
+
+def trie_matching(text, trie, patterns):
+    positions = []
+    for i in range(len(text)):
+        if prefix_trie_matching(text, i, trie, patterns) is not None:
+            positions.append(i)
+    return positions
+
+
+def solve(text, n, patterns):
+    tree = build_trie(patterns)
+    result = trie_matching(text, tree, patterns)
+
+    return result
+
+
+if __name__ == '__main__':
+    text = sys.stdin.readline().strip()
+    n = int(sys.stdin.readline().strip())
+    patterns = []
+    for i in range(n):
+        patterns.append(sys.stdin.readline().strip())
+
+    ans = solve(text, n, patterns)
+
+    sys.stdout.write(' '.join(map(str, ans)) + '\n')
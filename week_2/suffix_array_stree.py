@@ -1,4 +1,5 @@
 import sys
+from contextlib import nullcontext
 
 # Slow.
 
@@ -6,12 +7,17 @@ import sys
 This solution is NOT generalized, in the sense that it does depend on the alphabet.
 This is because we need to maintain an order of visiting child nodes when traversing the tree for the purpose of
 printing the leaf nodes' starting positions in text.
-The tree itself is general. I could have built it differently, where it would have taken the alphabet into account,
-and maintain the order of the children, but I have borrowed my own implementation of the Suffix Tree from Week 1.
-The implementation is general because it uses a dictionary for children, where the order between them
-is not defined. This has nothing to do with the order of insertion into the dictionary. We mean the comparison order,
-which is lexicographical (alphabetical).
-So, it was easier for me to make traversal take care of the order of visiting children, since it was possible to do it.
+The alphabet is taken from the text itself, as the sorted set of its characters, and every character gets its rank
+in it. Instead of a dictionary, a node has a list of children with one slot per character of the alphabet,
+so the child for a character c is children[rank of c]. That keeps the children in the comparison order,
+which is lexicographical (alphabetical), no matter in which order they were inserted.
+Earlier, children were kept in a dictionary, and traversal sorted them at every node it visited. That's O(n) small
+sorts on the hot path of every suffix array extraction. Now traversal just walks the slots.
+The slots take memory, though: an internal node's list takes 8 bytes per character of the alphabet, so the tree takes
+O(n * alphabet size) memory instead of O(n), and a list of 32 slots is already as large as a dictionary of 10 children.
+So, for alphabets of more than MAX_SLOTS characters, a node keeps its children in a _Children dictionary instead,
+which is indexed by rank like the list, and sorts its ranks only when traversal iterates over it.
+Leaves never get children, so they have no slots at all.
 
 The order that we need in this problem is the "in-order" traversal of the tree.
 We are not printing internal nodes (root included). We only print leaves. This makes it possible to use the "pre-order"
@@ -19,8 +25,23 @@ traversal of the tree, and modify it to take care of the order of visiting the c
 We use the iterative approach to traversing the tree.
 """
 
+MAX_SLOTS = 32  # Largest alphabet whose nodes keep a list of slots instead of a _Children dictionary.
 
-# ALPHABET = ('$', 'A', 'C', 'G', 'T')
+
+class _Children(dict):
+    """Children of a node for large alphabets, that behave like the list of slots: dict[int, Node] indexed by rank
+       of the first character of the edge, where a missing rank is None, and iteration gives children in rank order
+    """
+    __slots__ = ()
+
+    def __missing__(self, rank):
+        return None
+
+    def __iter__(self):
+        return map(self.__getitem__, sorted(self.keys()))
+
+    def __reversed__(self):
+        return map(self.__getitem__, sorted(self.keys(), reverse=True))
 
 
 class Node:
@@ -29,45 +50,114 @@ class Node:
     the substring length, and position in text at which the path to the leaf node begins, in case of leaf nodes only.
     """
 
-    def __init__(self, start=None, length=None, leaf_start=None):
-        self.children = {}  # dict[char, Node]
+    def __init__(self, width, start=None, length=None, leaf_start=None):
+        # list[Node], indexed by rank of the first character of the edge, or _Children for large alphabets;
+        # leaves never get children.
+        if leaf_start is not None:
+            self.children = ()
+        elif width <= MAX_SLOTS:
+            self.children = [None] * width
+        else:
+            self.children = _Children()
         self.start = start
         self.length = length
         self.leaf_start = leaf_start
 
 
-def _build_tree(text):
-    """Build suffix tree from text and return it"""
+def _build_tree(text, stats=None):
+    """Build suffix tree from text and return it
+
+       If stats, a BuildStats from "suffix_tree_debug.py" in week_1, is given, the tree is built by
+       _build_tree_counted(), which counts the construction into it, so that this loop doesn't pay for the counters.
+    """
+    if stats is not None:
+        return _build_tree_counted(text, stats)
+    alphabet = sorted(set(text))
+    width = len(alphabet)
+    ranks = {char: rank for rank, char in enumerate(alphabet)}  # dict[char, int]
+    ranked = [ranks[char] for char in text]  # Rank of every character of text.
+    suffix_length = 1 + len(text)
+    root = Node(width)
+    for i in range(len(text)):
+        suffix = text[i:]
+        suffix_length -= 1
+        current = root
+        j = 0
+        while j < suffix_length:
+            next_node = current.children[ranked[i+j]]
+            if next_node is None:
+                new_leaf = Node(width, start=i+j, length=suffix_length-j, leaf_start=i)
+                current.children[ranked[i+j]] = new_leaf
+                j += new_leaf.length  # break
+            else:
+                overlap = 0
+                while suffix[j+overlap] == text[next_node.start+overlap] and overlap < next_node.length:
+                    overlap += 1
+                if overlap == next_node.length:
+                    current = next_node
+                    j += overlap
+                else:
+                    new_internal = Node(width, start=next_node.start, length=overlap)
+                    new_leaf = Node(width, start=i+j+overlap, length=suffix_length-j-overlap, leaf_start=i)
+                    next_node.start += overlap
+                    next_node.length -= overlap
+                    new_internal.children[ranked[new_leaf.start]] = new_leaf
+                    new_internal.children[ranked[next_node.start]] = next_node
+                    current.children[ranked[new_internal.start]] = new_internal
+                    break
+    return root
+
+
+def _build_tree_counted(text, stats):
+    """Build suffix tree from text like _build_tree(), count the comparisons of characters, the splits,
+       the nodes and the peak depth into stats, and return it
+    """
+    comparisons = 0
+    splits = 0
+    nodes = 1
+    peak_depth = 0
+    alphabet = sorted(set(text))
+    width = len(alphabet)
+    ranks = {char: rank for rank, char in enumerate(alphabet)}  # dict[char, int]
+    ranked = [ranks[char] for char in text]  # Rank of every character of text.
     suffix_length = 1 + len(text)
-    root = Node()
+    root = Node(width)
     for i in range(len(text)):
         suffix = text[i:]
         suffix_length -= 1
         current = root
         j = 0
         while j < suffix_length:
-            try:
-                next_node = current.children[suffix[j]]
-            except KeyError:
-                new_leaf = Node(start=i+j, length=suffix_length-j, leaf_start=i)
-                current.children[suffix[j]] = new_leaf
+            next_node = current.children[ranked[i+j]]
+            if next_node is None:
+                new_leaf = Node(width, start=i+j, length=suffix_length-j, leaf_start=i)
+                current.children[ranked[i+j]] = new_leaf
+                nodes += 1
+                if j > peak_depth:
+                    peak_depth = j
                 j += new_leaf.length  # break
             else:
                 overlap = 0
                 while suffix[j+overlap] == text[next_node.start+overlap] and overlap < next_node.length:
                     overlap += 1
+                comparisons += overlap + 1  # The last comparison is the one that stopped the loop.
                 if overlap == next_node.length:
                     current = next_node
                     j += overlap
                 else:
-                    new_internal = Node(start=next_node.start, length=overlap)
-                    new_leaf = Node(start=i+j+overlap, length=suffix_length-j-overlap, leaf_start=i)
+                    new_internal = Node(width, start=next_node.start, length=overlap)
+                    new_leaf = Node(width, start=i+j+overlap, length=suffix_length-j-overlap, leaf_start=i)
                     next_node.start += overlap
                     next_node.length -= overlap
-                    new_internal.children[text[new_leaf.start]] = new_leaf
-                    new_internal.children[text[next_node.start]] = next_node
-                    current.children[text[new_internal.start]] = new_internal
+                    new_internal.children[ranked[new_leaf.start]] = new_leaf
+                    new_internal.children[ranked[next_node.start]] = next_node
+                    current.children[ranked[new_internal.start]] = new_internal
+                    splits += 1
+                    nodes += 2
+                    if j + overlap > peak_depth:
+                        peak_depth = j + overlap
                     break
+    stats.record(comparisons, splits, nodes, peak_depth)
     return root
 
 
@@ -83,8 +173,9 @@ def _traverse_tree_pre_order_(tree):
         node = stack.pop()
         if node.leaf_start is not None:
             result.append(node.leaf_start)
-        for _, child in sorted(node.children.items()):
-            stack.append(child)
+        for child in node.children:
+            if child is not None:
+                stack.append(child)
     result.reverse()
     return result
 
@@ -101,21 +192,27 @@ def _traverse_tree_pre_order(tree):
         node = stack.pop()
         if node.leaf_start is not None:
             result.append(node.leaf_start)
-        for _, child in reversed(sorted(node.children.items())):
-            stack.append(child)
+        for child in reversed(node.children):
+            if child is not None:
+                stack.append(child)
     return result
 
 
-def build_suffix_array(text):
+def build_suffix_array(text, stats=None):
     """
     Build suffix array of the string text and
     return a list result of the same length as the text
     such that the value result[i] is the index (0-based)
     in text where the i-th lexicographically smallest
     suffix of text starts.
+    If stats is given, the construction is counted into it, and the times of building and traversing the tree
+    are measured.
     """
-    tree = _build_tree(text)
-    result = _traverse_tree_pre_order(tree)
+    phase = nullcontext if stats is None else stats.phase
+    with phase("tree"):
+        tree = _build_tree(text, stats)
+    with phase("traversal"):
+        result = _traverse_tree_pre_order(tree)
     return result
 
 
@@ -0,0 +1,93 @@
+"""
+LCP array in O(n) from the text and its suffix array, e.g., from build_suffix_array() in "suffix_array_sais.py",
+"suffix_array_matching.py" or "suffix_array_numpy.py". lcp[i] is the length of the longest common prefix
+of the suffixes suffix_array[i] and suffix_array[i + 1], so there are n - 1 of them, which is the format that
+suffix_array_to_suffix_tree() in "suffix_tree_from_array.py" takes.
+
+Both algorithms go over the suffixes in the order of the text, and use the fact that if the suffix at i has
+h common characters with the suffix before it in the suffix array, then the suffix at i + 1 has at least h - 1
+common characters with the suffix before it. So, h decreases by at most one per step, and the total number
+of character comparisons is at most 2n.
+    * Kasai et al. keeps the inverse of the suffix array (rank), to find the suffix before the suffix at i.
+    * The Φ algorithm of Kärkkäinen, Manzini and Puglisi keeps Φ[i], the suffix before the suffix at i, instead,
+      and overwrites it in place with the permuted LCP (PLCP[i] = LCP of the suffix at i with the one before it).
+      So, permuted_lcp() takes a single array of n integers, where Kasai takes the rank and the LCP array,
+      and phi() only adds the LCP array at the end, when the LCPs are needed in the order of the suffix array.
+Both return typed arrays of integers ('i', or 'q' for texts that don't fit).
+"""
+
+import sys
+from array import array
+
+from suffix_array_sais import build_suffix_array
+
+
+def _typecode(text):
+    return 'i' if len(text) < 2**31 else 'q'
+
+
+def _extend(text, i, j, h):
+    """Return length of the longest common prefix of the suffixes at i and j, which is known to be at least h"""
+    n = len(text)
+    while i + h < n and j + h < n and text[i + h] == text[j + h]:
+        h += 1
+    return h
+
+
+def kasai(text, suffix_array):
+    """Return LCP array of text, whose suffix array is suffix_array, with the algorithm of Kasai et al."""
+    n = len(text)
+    typecode = _typecode(text)
+    rank = array(typecode, [0]) * n
+    for i, suffix in enumerate(suffix_array):
+        rank[suffix] = i
+    lcp = array(typecode, [0]) * max(n - 1, 0)
+    h = 0
+    for i in range(n):
+        r = rank[i]
+        if r == 0:
+            h = 0
+            continue
+        h = _extend(text, i, suffix_array[r - 1], h)
+        lcp[r - 1] = h
+        if h > 0:
+            h -= 1
+    return lcp
+
+
+def permuted_lcp(text, suffix_array):
+    """Return PLCP array of text: PLCP[i] is the LCP of the suffix at i with the suffix before it in suffix_array,
+       or 0 for the smallest suffix
+    """
+    n = len(text)
+    plcp = array(_typecode(text), [0]) * n  # Φ first, and then PLCP, in place.
+    previous = -1
+    for suffix in suffix_array:
+        plcp[suffix] = previous
+        previous = suffix
+    h = 0
+    for i in range(n):
+        j = plcp[i]
+        if j == -1:
+            h = 0
+        else:
+            h = _extend(text, i, j, h)
+        plcp[i] = h
+        if h > 0:
+            h -= 1
+    return plcp
+
+
+def phi(text, suffix_array):
+    """Return LCP array of text, whose suffix array is suffix_array, with the Φ algorithm"""
+    plcp = permuted_lcp(text, suffix_array)
+    return array(plcp.typecode, (plcp[suffix] for suffix in suffix_array[1:]))
+
+
+if __name__ == '__main__':
+    # Input: text. Output: text, its suffix array, and its LCP array, which is the input of "suffix_tree_from_array.py".
+    text = sys.stdin.readline().strip()
+    suffix_array = build_suffix_array(text, sorted(set(text)))
+    print(text)
+    print(" ".join(map(str, suffix_array)))
+    print(" ".join(map(str, kasai(text, suffix_array))))
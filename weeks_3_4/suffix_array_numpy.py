@@ -0,0 +1,75 @@
+"""
+The same cyclic prefix doubling as in "suffix_array_matching.py", with every pass done by NumPy array operations
+instead of Python loops over the whole text:
+    * sort_characters() is a stable argsort of the ranks of the characters in the alphabet;
+    * compute_char_classes() and update_classes() compare neighbours in the order all at once,
+      and a cumulative sum of the differences gives the classes, which are scattered to their positions;
+    * sort_doubled() shifts the order back by length, which keeps it sorted by the second halves,
+      and a stable argsort of the classes of the first halves sorts it by the whole doubled cyclic shifts.
+Positions and classes are int32 arrays (int64 for texts that don't fit), so a pass over 10^7 characters takes
+about a second instead of about a minute. Doubling also stops as soon as all the classes are different,
+because the order can't change anymore after that; for random texts that's after about log(n) characters.
+
+build_suffix_array() takes the same arguments as the one in "suffix_array_matching.py", and gives the same order,
+as a NumPy array instead of a list. Either one can be used; they're compared in "suffix_array_testing.py".
+"""
+
+import sys
+
+import numpy as np
+
+
+def _ranks(text, alphabet, dtype):
+    """Return NumPy array of the ranks of the characters of text in the alphabet"""
+    ranks = {char: rank for rank, char in enumerate(alphabet)}
+    try:
+        data = np.frombuffer(text.encode("latin-1"), dtype=np.uint8)
+    except UnicodeEncodeError:
+        return np.fromiter(map(ranks.__getitem__, text), dtype=dtype, count=len(text))
+    table = np.zeros(256, dtype=dtype)
+    for char, rank in ranks.items():
+        table[ord(char)] = rank
+    return table[data]
+
+
+def _classes(order, first, second=None):
+    """Return classes of the positions in order, given the keys first (and second) of the positions, in order"""
+    different = first[1:] != first[:-1]
+    if second is not None:
+        different |= second[1:] != second[:-1]
+    klass = np.empty(len(order), dtype=order.dtype)
+    klass[order[0]] = 0
+    klass[order[1:]] = np.cumsum(different, dtype=order.dtype)
+    return klass
+
+
+def build_suffix_array(text, alphabet):
+    """
+    Build suffix array of the string text and
+    return a NumPy array result of the same length as the text
+    such that the value result[i] is the index (0-based)
+    in text where the i-th lexicographically smallest
+    suffix of text starts.
+    """
+    n = len(text)
+    dtype = np.int32 if n < 2**31 else np.int64
+    if n == 0:
+        return np.empty(0, dtype=dtype)
+    codes = _ranks(text, alphabet, dtype)
+    order = np.argsort(codes, kind='stable').astype(dtype)
+    klass = _classes(order, codes[order])
+    length = 1
+    while length < n and klass[order[-1]] < n - 1:
+        shifted = order - length
+        shifted[shifted < 0] += n
+        order = shifted[np.argsort(klass[shifted], kind='stable')]
+        middle = order + length
+        middle[middle >= n] -= n
+        klass = _classes(order, klass[order], klass[middle])
+        length *= 2
+    return order
+
+
+if __name__ == '__main__':
+    text = sys.stdin.readline().strip()
+    print(" ".join(map(str, build_suffix_array(text, sorted(set(text))).tolist())))
@@ -0,0 +1,155 @@
+"""
+Suffix array in O(n) with SA-IS (induced sorting) of Nong, Zhang and Chan, instead of the O(n log n)
+cyclic prefix doubling of "suffix_array_long.py" and "suffix_array_matching.py",
+whose every pass goes over all of the text a few times, in sort_doubled() and update_classes().
+
+Every suffix is of type S if it's smaller than the next suffix, and of type L if it's larger.
+An S-suffix whose previous suffix is an L-suffix is a leftmost S-suffix (LMS). The last suffix, "$", is LMS.
+    * If the LMS suffixes are sorted already, all the other suffixes are sorted by induction, in two scans:
+      L-suffixes go to the heads of their buckets (buckets are by the first character) in one scan from the left,
+      and S-suffixes to the tails of their buckets in one scan from the right.
+    * To sort the LMS suffixes, the same induction is run with them in any order first. That sorts the LMS substrings,
+      which go from one LMS position to the next. Equal neighbouring substrings get the same name, and the names,
+      in the order of their positions in text, make a text of at most n/2 characters. Its suffix array gives
+      the order of the LMS suffixes. If all the names are different, it's simply the inverse of the names;
+      otherwise, it's computed recursively. So, time is T(n) = T(n/2) + O(n) = O(n).
+The text and all the work buffers are typed arrays of integers ('i', or 'q' for texts that don't fit in it),
+and the types of suffixes are a bytearray, so that there's no list of Python integers of the length of text.
+
+The result is the same as build_suffix_array() in "suffix_array_matching.py" returns, for the same arguments,
+as an array instead of a list: the text must end with '$', which must occur only there,
+and must be the smallest character of the alphabet, which must be sorted.
+Both are compared in "suffix_array_testing.py".
+"""
+
+import sys
+from array import array
+
+
+def _bucket_heads(counts):
+    heads = []
+    total = 0
+    for count in counts:
+        heads.append(total)
+        total += count
+    return heads
+
+
+def _bucket_tails(counts):
+    tails = []
+    total = 0
+    for count in counts:
+        total += count
+        tails.append(total)
+    return tails
+
+
+def _induce(s, types, suffix_array, counts):
+    """Induce the order of L-suffixes, and then of S-suffixes, from the LMS suffixes in suffix_array"""
+    heads = _bucket_heads(counts)
+    for i in range(len(s)):
+        j = suffix_array[i] - 1
+        if j >= 0 and not types[j]:
+            char = s[j]
+            suffix_array[heads[char]] = j
+            heads[char] += 1
+    tails = _bucket_tails(counts)
+    for i in range(len(s) - 1, -1, -1):
+        j = suffix_array[i] - 1
+        if j >= 0 and types[j]:
+            char = s[j]
+            tails[char] -= 1
+            suffix_array[tails[char]] = j
+
+
+def _sais(s, alphabet_size, typecode):
+    """Return suffix array of s, an array of integers less than alphabet_size, which ends with a unique 0"""
+    n = len(s)
+    if n == 1:
+        return array(typecode, [0])
+
+    types = bytearray(n)  # 1 for S-suffixes, 0 for L-suffixes.
+    types[n - 1] = 1
+    for i in range(n - 2, -1, -1):
+        if s[i] < s[i + 1] or s[i] == s[i + 1] and types[i + 1]:
+            types[i] = 1
+    lms = array(typecode, (i for i in range(1, n) if types[i] and not types[i - 1]))
+
+    counts = [0] * alphabet_size
+    for char in s:
+        counts[char] += 1
+
+    # Sort the LMS substrings.
+    suffix_array = array(typecode, [-1]) * n
+    tails = _bucket_tails(counts)
+    for i in reversed(lms):
+        char = s[i]
+        tails[char] -= 1
+        suffix_array[tails[char]] = i
+    _induce(s, types, suffix_array, counts)
+
+    # Name them. LMS positions are at least two apart, so position // 2 indexes them.
+    names = array(typecode, [-1]) * (n // 2 + 1)
+    name = -1
+    previous = -1
+    for i in range(n):
+        position = suffix_array[i]
+        if position <= 0 or not types[position] or types[position - 1]:
+            continue
+        if previous == -1 or position == n - 1 or previous == n - 1:
+            equal = False
+        else:
+            offset = 0
+            while True:
+                a = position + offset
+                b = previous + offset
+                if s[a] != s[b] or types[a] != types[b]:
+                    equal = False
+                    break
+                if offset > 0 and types[a] and not types[a - 1]:
+                    # Both substrings end here, as their characters and types have been equal so far.
+                    equal = True
+                    break
+                offset += 1
+        if not equal:
+            name += 1
+        names[position // 2] = name
+        previous = position
+
+    reduced = array(typecode, (names[i // 2] for i in lms))
+    if name + 1 == len(lms):
+        reduced_suffix_array = array(typecode, [0]) * len(lms)
+        for i, char in enumerate(reduced):
+            reduced_suffix_array[char] = i
+    else:
+        reduced_suffix_array = _sais(reduced, name + 1, typecode)
+
+    # Sort all the suffixes from the sorted LMS suffixes.
+    suffix_array = array(typecode, [-1]) * n
+    tails = _bucket_tails(counts)
+    for i in reversed(reduced_suffix_array):
+        position = lms[i]
+        char = s[position]
+        tails[char] -= 1
+        suffix_array[tails[char]] = position
+    _induce(s, types, suffix_array, counts)
+    return suffix_array
+
+
+def build_suffix_array(text, alphabet):
+    """
+    Build suffix array of the string text and
+    return an array result of the same length as the text
+    such that the value result[i] is the index (0-based)
+    in text where the i-th lexicographically smallest
+    suffix of text starts.
+    """
+    typecode = 'i' if len(text) < 2**31 else 'q'
+    ranks = {char: rank for rank, char in enumerate(alphabet)}
+    s = array(typecode, map(ranks.__getitem__, text))
+    return _sais(s, len(alphabet), typecode)
+
+
+if __name__ == '__main__':
+    text = sys.stdin.readline().strip()
+    print(" ".join(map(str, build_suffix_array(text, sorted(set(text))))))
@@ -0,0 +1,74 @@
+""" Test and compare various implementations of the suffix array to one another """
+from datetime import timedelta
+from random import choices
+from timeit import default_timer as timer
+
+import lcp_array
+import suffix_array_matching
+import suffix_array_numpy
+import suffix_array_sais
+
+
+"""
+Cyclic prefix doubling from "suffix_array_matching.py" is O(n log n), with about log2(n) passes in pure Python,
+so it's only run up to DOUBLING_MAX_LENGTH, where it takes about a minute. SA-IS from "suffix_array_sais.py" is O(n),
+and it's run up to MAX_LENGTH; a random DNA text of length 10**8 takes about 2 GB of memory and several minutes.
+The same prefix doubling with NumPy, from "suffix_array_numpy.py", is run up to NUMPY_MAX_LENGTH;
+it takes about 15 s for a random DNA text of length 10**7.
+Where more than one is run, their suffix arrays must be the same,
+and also the same as sorting the suffixes, for short texts.
+LCP arrays from Kasai's algorithm and from the Φ algorithm, in "lcp_array.py", must be the same, too.
+"""
+
+
+ALPHABET = ('A', 'C', 'G', 'T')
+SORTED_MAX_LENGTH = 10**4
+DOUBLING_MAX_LENGTH = 10**6
+NUMPY_MAX_LENGTH = 10**7
+MAX_LENGTH = 10**8
+
+
+def generate_text(length):
+    text = choices(population=ALPHABET, k=length - 1)
+    return "".join(text) + '$'
+
+
+def generate_run(length):
+    return 'A' * (length - 1) + '$'
+
+
+def measure(build, text, alphabet):
+    start = timer()
+    suffix_array = build(text, alphabet)
+    end = timer()
+    return suffix_array, end - start
+
+
+def compare(text, name):
+    alphabet = sorted(set(text))
+    line = f"{name} of length {len(text)}:"
+    sais_array, sais_time = measure(suffix_array_sais.build_suffix_array, text, alphabet)
+    if len(text) <= DOUBLING_MAX_LENGTH:
+        doubling_array, doubling_time = measure(suffix_array_matching.build_suffix_array, text, alphabet)
+        assert list(sais_array) == doubling_array
+        line += f" Prefix doubling took {doubling_time:.3f} s,"
+    if len(text) <= NUMPY_MAX_LENGTH:
+        numpy_array, numpy_time = measure(suffix_array_numpy.build_suffix_array, text, alphabet)
+        assert numpy_array.tolist() == list(sais_array)
+        line += f" NumPy prefix doubling took {numpy_time:.3f} s,"
+    if len(text) <= SORTED_MAX_LENGTH:
+        assert list(sais_array) == sorted(range(len(text)), key=lambda i: text[i:])
+    kasai_array, kasai_time = measure(lcp_array.kasai, text, sais_array)
+    phi_array, phi_time = measure(lcp_array.phi, text, sais_array)
+    assert kasai_array == phi_array
+    line += f" LCP: Kasai took {kasai_time:.3f} s, Φ took {phi_time:.3f} s,"
+    print(f"{line} SA-IS took {sais_time:.3f} s [{timedelta(seconds=sais_time)}], "
+          f"{sais_time / len(text) * 10**6:.2f} µs per character")
+
+
+if __name__ == '__main__':
+    length = 10**4
+    while length <= MAX_LENGTH:
+        compare(generate_text(length), "Random text")
+        compare(generate_run(length), "Run of 'A'")
+        length *= 10
@@ -1,4 +1,12 @@
 import sys
+from array import array
+from contextlib import nullcontext
+from itertools import chain, islice
+
+from lcp_array import kasai
+from suffix_array_sais import build_suffix_array
+
+BUFFER_EDGES = 1 << 16  # Number of edges that are written at once.
 
 
 class Node:
@@ -37,11 +45,17 @@ def break_edge(node, text, start, offset, leaf_start):
     return mid_node
 
 
-def suffix_array_to_suffix_tree(suffix_array, lcp_array, text):
+def suffix_array_to_suffix_tree(suffix_array, lcp_array, text, stats=None):
     """
     Build suffix tree of the string text given its suffix array suffix_array and LCP array lcp_array.
         * start is the starting position (0-based) of the substring of text corresponding to the edge label
         * end is the first position (0-based) after the end of the substring corresponding to the edge label
+    Suffixes are inserted in lexicographic order, so a new child is always the greatest child of its node,
+    and break_edge() replaces a child by a node whose edge starts with the same character. So, the order of insertion
+    into node.children is lexicographic, and traversals don't need to sort the children.
+    If stats, a BuildStats from "suffix_tree_debug.py" in week_1, is given, the nodes, the splits and the largest LCP,
+    which is the largest string depth at which a leaf is inserted, are counted into it after the tree is built,
+    so that the loop doesn't pay for it. No characters are compared.
     """
     length = len(text)
     root = Node()
@@ -60,31 +74,122 @@ def suffix_array_to_suffix_tree(suffix_array, lcp_array, text):
             current = create_new_leaf(mid_node, text, suffix, length, i)
         if i < length - 1:
             lcp_prev = lcp_array[i]
+    if stats is not None:
+        nodes = 1 + sum(1 for _ in traverse_tree_pre_order(root))
+        # There are n leaves, and every other internal node than the root is made by one split.
+        stats.record(splits=nodes - length - 1, nodes=nodes, peak_depth=max(islice(lcp_array, length - 1), default=0))
     return root
 
 
+def suffix_array_to_arrays(suffix_array, lcp_array, text, stats=None):
+    """
+    Build suffix tree of the string text given its suffix array suffix_array and LCP array lcp_array,
+    like suffix_array_to_suffix_tree(), but as parallel arrays (parent, string_depth, start, end), without any Node.
+        * Node IDs 0 to n - 1 are the leaves, in the order of the suffix array: leaf i is the suffix suffix_array[i].
+        * Node n is the root, whose parent is -1, and internal nodes follow it, in the order in which the stack pass
+          creates them, which is the order of the first position in the LCP array that has their string depth.
+    start and end are the same as in the tree of Node objects.
+    The stack holds the path from the root to the previous leaf, so going up is a pop instead of a parent pointer.
+    stats, if given, is counted into like in suffix_array_to_suffix_tree(), after the arrays are built.
+    """
+    length = len(text)
+    typecode = 'i' if 2 * length < 2**31 else 'q'
+    parent = array(typecode, [-1]) * (length + 1)
+    string_depth = array(typecode, [0]) * (length + 1)
+    start = array(typecode, [0]) * (length + 1)
+    end = array(typecode, [length]) * length + array(typecode, [0])
+    stack = [length]
+    for i in range(length):
+        suffix = suffix_array[i]
+        if i > 0:
+            lcp = lcp_array[i - 1]
+            last = -1
+            while string_depth[stack[-1]] > lcp:
+                last = stack.pop()
+            top = stack[-1]
+            top_depth = string_depth[top]
+            if top_depth < lcp:
+                # Break the edge that leads into "last", like break_edge() does.
+                previous = suffix_array[i - 1]
+                mid_node = len(parent)
+                parent.append(top)
+                string_depth.append(lcp)
+                start.append(previous + top_depth)
+                end.append(previous + lcp)
+                parent[last] = mid_node
+                start[last] += lcp - top_depth
+                stack.append(mid_node)
+        top = stack[-1]
+        parent[i] = top
+        string_depth[i] = length - suffix
+        start[i] = suffix + string_depth[top]
+        stack.append(i)
+    if stats is not None:
+        nodes = len(parent)
+        stats.record(splits=nodes - length - 1, nodes=nodes, peak_depth=max(islice(lcp_array, length - 1), default=0))
+    return parent, string_depth, start, end
+
+
+def text_to_suffix_tree(text, alphabet=None, stats=None):
+    """
+    Build suffix tree of the string text, which ends with '$', in one process, without reading the suffix array
+    and the LCP array: the suffix array is built with SA-IS, the LCP array with Kasai's algorithm,
+    and then the tree with suffix_array_to_suffix_tree(). By default, the alphabet is the sorted characters of text.
+    stats, if given, is passed on to suffix_array_to_suffix_tree(), and the three steps are measured as phases.
+    """
+    if alphabet is None:
+        alphabet = sorted(set(text))
+    phase = nullcontext if stats is None else stats.phase
+    with phase("suffix array"):
+        suffix_array = build_suffix_array(text, alphabet)
+    with phase("lcp array"):
+        lcp_array = kasai(text, suffix_array)
+    with phase("tree"):
+        return suffix_array_to_suffix_tree(suffix_array, lcp_array, text, stats)
+
+
 def traverse_tree_recursive(tree):
 
     def traverse(tup):
         """Pre-order"""
         if tup[1] is None:
             return
-        print(tup[1].start, tup[1].end)  # Visit.
-        for char, child in sorted(tup[1].children.items()):
-            traverse((char, child))
+        yield tup[1].start, tup[1].end  # Visit.
+        for char, child in tup[1].children.items():
+            yield from traverse((char, child))
 
-    for char, child in sorted(tree.children.items()):
-        traverse((char, child))
+    for char, child in tree.children.items():
+        yield from traverse((char, child))
 
 
 def traverse_tree_pre_order(tree):
-    root_children = sorted(tree.children.items(), reverse=True)
-    stack = root_children
+    """Yield (start, end) of all edges of tree, in pre-order, with children in lexicographic order
+
+       Children are inserted into node.children in lexicographic order already, so there's nothing to sort.
+    """
+    stack = list(reversed(tree.children.values()))
     while stack:
-        node = stack.pop()[1]
-        print("%d %d" % (node.start, node.end))
-        for char, child in sorted(node.children.items(), reverse=True):
-            stack.append((char, child))
+        node = stack.pop()
+        yield node.start, node.end
+        stack.extend(reversed(node.children.values()))
+
+
+def write_edges(edges, output=None):
+    """Write edges, given as (start, end) pairs, to output, one "start end" per line
+
+       BUFFER_EDGES edges at a time are formatted with a single % operation into one buffer, which is written at once,
+       instead of one print() per edge. By default, output is the binary stdout.
+    """
+    if output is None:
+        sys.stdout.flush()
+        output = sys.stdout.buffer
+    edges = iter(edges)
+    while True:
+        chunk = list(islice(edges, BUFFER_EDGES))
+        if not chunk:
+            break
+        output.write(("%d %d\n" * len(chunk) % tuple(chain.from_iterable(chunk))).encode())
+    output.flush()
 
 
 if __name__ == "__main__":
@@ -95,4 +200,4 @@ if __name__ == "__main__":
 
     tree = suffix_array_to_suffix_tree(sa, lcp, text)
 
-    traverse_tree_pre_order(tree)
+    write_edges(traverse_tree_pre_order(tree))
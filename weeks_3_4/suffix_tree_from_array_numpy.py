@@ -0,0 +1,113 @@
+"""
+The same parallel arrays (parent, string_depth, start, end) as suffix_array_to_arrays() in "suffix_tree_from_array.py"
+returns, with the same node IDs, but computed with NumPy array operations instead of a stack.
+
+Positions between neighbouring leaves are "boundaries": boundary j lies between leaves j - 1 and j, and its value is
+the LCP of their suffixes. Two virtual boundaries of value 0 are added, before the first leaf and after the last one.
+Every internal node of the tree is a maximal run of leaves whose inner boundaries are all at least its string depth,
+so it's made of the boundaries of exactly that value inside the run:
+    * boundary j starts a new node if the nearest previous boundary of a smaller or equal value is smaller;
+      otherwise, it belongs to the same node as that boundary. Boundary 0 is the root.
+    * the parent of a node is the node of the deeper of the two boundaries that end its run, which are
+      the nearest strictly smaller values on both sides (ANSV - all nearest smaller values).
+    * the parent of a leaf is the node of the deeper of the two boundaries next to it.
+Nearest smaller values are found with pointer jumping. Every boundary starts with its left neighbour as a candidate,
+and while the candidate's value isn't smaller, jumps to the candidate's own candidate, as everything in between is
+not smaller either. All boundaries jump at once, in a loop of array operations, and the jumps get longer and longer,
+so the loop takes about log(n) iterations on typical texts. The node of every boundary is found the same way,
+following the nearest previous equal values to the first boundary of the node.
+"""
+
+import sys
+
+import numpy as np
+
+from suffix_tree_from_array import write_edges
+
+
+def _previous_smaller(values, strict):
+    """Return, for every position, the nearest previous position with a smaller value, or -1 if there's none;
+       if not strict, the nearest previous position with a smaller or equal value
+    """
+    candidate = np.arange(-1, len(values) - 1)
+    active = np.arange(1, len(values))
+    while active.size:
+        current = candidate[active]
+        if strict:
+            blocked = values[current] >= values[active]
+        else:
+            blocked = values[current] > values[active]
+        blocked &= current != -1
+        active = active[blocked]
+        candidate[active] = candidate[current[blocked]]
+    return candidate
+
+
+def suffix_array_to_arrays(suffix_array, lcp_array, text, stats=None):
+    """
+    Build suffix tree of the string text given its suffix array suffix_array and LCP array lcp_array,
+    and return it as NumPy arrays (parent, string_depth, start, end), like suffix_array_to_arrays()
+    in "suffix_tree_from_array.py". stats, if given, is counted into like there, after the arrays are built.
+    """
+    length = len(text)
+    dtype = np.int32 if 2 * length < 2**31 else np.int64
+    suffix_array = np.asarray(suffix_array, dtype=np.int64)
+    values = np.zeros(length + 1, dtype=np.int64)
+    values[1: length] = np.asarray(lcp_array, dtype=np.int64)[: length - 1]
+
+    previous = _previous_smaller(values, strict=False)
+    following = length - _previous_smaller(values[::-1], strict=True)[::-1]
+    first = np.ones(length + 1, dtype=bool)
+    first[1:] = values[previous[1:]] < values[1:]
+
+    # The first boundary of the node of every boundary.
+    owner = np.where(first, np.arange(length + 1), previous)
+    while True:
+        jumped = owner[owner]
+        if np.array_equal(jumped, owner):
+            break
+        owner = jumped
+    firsts = np.flatnonzero(first)
+    node_id = np.empty(length + 1, dtype=np.int64)
+    node_id[firsts] = length + np.arange(len(firsts))
+    node_of = node_id[owner]
+
+    nodes = length + len(firsts)
+    parent = np.empty(nodes, dtype=np.int64)
+    string_depth = np.empty(nodes, dtype=np.int64)
+    start = np.empty(nodes, dtype=np.int64)
+    end = np.empty(nodes, dtype=np.int64)
+
+    leaves = np.arange(length)
+    parent[:length] = node_of[np.where(values[leaves] >= values[leaves + 1], leaves, leaves + 1)]
+    string_depth[:length] = length - suffix_array
+
+    inner = firsts[1:]
+    left = previous[inner]
+    right = following[inner]
+    parent[length] = -1
+    parent[length + 1:] = node_of[np.where(values[left] >= values[right], left, right)]
+    string_depth[length] = 0
+    string_depth[length + 1:] = values[inner]
+
+    # An internal node's edge is taken from the leaf just before its first boundary, like in break_edge().
+    representative = np.concatenate((suffix_array, [0], suffix_array[inner - 1]))
+    start[:] = representative + string_depth[parent]
+    start[length] = 0
+    end[:length] = length
+    end[length:] = representative[length:] + string_depth[length:]
+    if stats is not None:
+        stats.record(splits=nodes - length - 1, nodes=nodes, peak_depth=int(values.max()))
+    return parent.astype(dtype), string_depth.astype(dtype), start.astype(dtype), end.astype(dtype)
+
+
+if __name__ == "__main__":
+    # Input is the same as in "suffix_tree_from_array.py"; edges are written in the order of node IDs.
+    text = sys.stdin.readline().strip()
+    sa = list(map(int, sys.stdin.readline().strip().split()))
+    lcp = list(map(int, sys.stdin.readline().strip().split()))
+    print(text)
+
+    parent, string_depth, start, end = suffix_array_to_arrays(sa, lcp, text)
+    nodes = np.flatnonzero(parent != -1)
+    write_edges(zip(start[nodes].tolist(), end[nodes].tolist()))
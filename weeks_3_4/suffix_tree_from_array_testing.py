@@ -0,0 +1,58 @@
+""" Test and compare the tree of Node objects with the flat arrays built from the same suffix array and LCP array """
+from collections import Counter
+from random import choices
+from timeit import default_timer as timer
+
+import suffix_tree_from_array
+import suffix_tree_from_array_numpy
+from lcp_array import kasai
+from suffix_array_sais import build_suffix_array
+
+
+"""
+All three builders get the same suffix array and LCP array, and must give the same edges.
+The two array builders must also give exactly the same arrays, with the same node IDs.
+The suffix array (SA-IS) and the LCP array (Kasai) are computed once per text, and aren't included in the times.
+"""
+
+
+ALPHABET = ('A', 'C', 'G', 'T')
+MAX_LENGTH = 10**6
+
+
+def generate_text(length):
+    text = choices(population=ALPHABET, k=length - 1)
+    return "".join(text) + '$'
+
+
+def measure(build, *args):
+    start = timer()
+    result = build(*args)
+    end = timer()
+    return result, end - start
+
+
+def compare(length):
+    text = generate_text(length)
+    suffix_array = build_suffix_array(text, sorted(set(text)))
+    lcp_array = kasai(text, suffix_array)
+
+    tree, objects_time = measure(suffix_tree_from_array.suffix_array_to_suffix_tree, suffix_array, lcp_array, text)
+    arrays, arrays_time = measure(suffix_tree_from_array.suffix_array_to_arrays, suffix_array, lcp_array, text)
+    numpy_arrays, numpy_time = measure(suffix_tree_from_array_numpy.suffix_array_to_arrays,
+                                       suffix_array, lcp_array, text)
+
+    parent, _, start, end = arrays
+    edges = Counter((start[node], end[node]) for node in range(len(parent)) if parent[node] != -1)
+    assert edges == Counter(suffix_tree_from_array.traverse_tree_pre_order(tree))
+    assert all(list(column) == numpy_column.tolist() for column, numpy_column in zip(arrays, numpy_arrays))
+
+    print(f"Random text of length {length} ({len(parent)} nodes): Node objects took {objects_time:.3f} s, "
+          f"arrays took {arrays_time:.3f} s, NumPy took {numpy_time:.3f} s")
+
+
+if __name__ == '__main__':
+    length = 10**3
+    while length <= MAX_LENGTH:
+        compare(length)
+        length *= 10